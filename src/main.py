@@ -1,21 +1,96 @@
+import asyncio
+import atexit
 import base64
 import contextlib
-import json
+import logging
+import logging.handlers
 import os
+import queue
+import signal
+import socket
+import sys
+from collections import deque
+from collections.abc import Awaitable, Callable
+from itertools import groupby
 from typing import Any
 
 from dotenv import load_dotenv
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi import FastAPI, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import HTMLResponse, JSONResponse, Response
 from openai import AsyncAzureOpenAI
+import orjson
 
 # Import sideband module for WebRTC + WebSocket session separation
-from src.sideband import create_sideband_app
+from src.precompressed import compress_variants, precompressed_response
+from src.sideband import close_shared_clients, create_sideband_app
 
 load_dotenv()
 
+
+def _configure_logging() -> None:
+    """Route every logger in the process, sideband included, through one root QueueHandler.
+
+    The listener thread does the blocking stdout write, so a log burst never
+    stalls the event loop.
+    """
+    root = logging.getLogger()
+    root.setLevel(os.getenv('LOG_LEVEL', 'INFO').upper())
+    # `python -m src.main` runs this module as __main__ and uvicorn imports it
+    # again as src.main; only the first import installs the handler.
+    if any(isinstance(handler, logging.handlers.QueueHandler) for handler in root.handlers):
+        return
+    log_queue: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+    stream = logging.StreamHandler(sys.stdout)
+    stream.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s %(message)s"))
+    listener = logging.handlers.QueueListener(log_queue, stream)
+    listener.start()
+    atexit.register(listener.stop)
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+
+
+_configure_logging()
+logger = logging.getLogger("realtime-proxy")
+
 DEFAULT_API_VERSION = "2025-04-01-preview"
 
+# Streaming deltas are coalesced into `batch` envelopes and flushed on whichever
+# threshold is hit first, so a single downstream frame carries many Azure events.
+BATCH_FLUSH_INTERVAL_SECONDS = 0.015
+BATCH_MAX_BYTES = 64 * 1024
+
+# Constant envelopes are serialized once so the per-turn path skips encoding.
+TEXT_RESET_FRAME = orjson.dumps({'type': 'text-reset'}).decode()
+TRANSCRIPT_RESET_FRAME = orjson.dumps({'type': 'transcript-reset'}).decode()
+
+SESSION_CONFIG: dict[str, Any] = {
+    'instructions': 'You are a helpful assistant. You respond by voice and text.',
+    'output_modalities': ['text', 'audio'],
+    'audio': {
+        'input': {
+            'transcription': {'model': 'whisper-1'},
+            'format': {'type': 'audio/pcm', 'rate': 24000},
+            'turn_detection': {
+                'type': 'server_vad',
+                'threshold': 0.5,
+                'prefix_padding_ms': 300,
+                'silence_duration_ms': 200,
+                'create_response': True,
+            },
+        },
+        'output': {
+            'voice': 'alloy',
+            'format': {'type': 'audio/pcm', 'rate': 24000},
+        },
+    },
+}
+
+# Upstream client events that never change are built once and reused for every turn.
+SESSION_UPDATE_EVENT: dict[str, Any] = {'type': 'session.update', 'session': SESSION_CONFIG}
+RESPONSE_CREATE_EVENT: dict[str, Any] = {'type': 'response.create'}
+
+# Audio is sent as binary frames: a one-byte tag followed by raw PCM16 samples.
+AUDIO_FRAME_TAG = b'\x01'
+
 app = FastAPI(title="Realtime minimal web")
 
 # Mount sideband app for WebRTC + WebSocket session separation demo
@@ -60,6 +135,8 @@ INDEX_HTML = """
       const input = document.getElementById('chat-input');
       const wsEndpoint = '{{WS_ENDPOINT}}';
       const socket = new WebSocket(wsEndpoint);
+      socket.binaryType = 'arraybuffer';
+      const AUDIO_FRAME_TAG = 0x01;
       let audioBytes = 0;
       let audioCtx;
       let audioPlayhead = 0;
@@ -76,24 +153,19 @@ INDEX_HTML = """
 
       window.addEventListener('click', () => ensureAudioContext(), { once: true });
 
-      function playPcmChunk(base64Chunk) {
-        if (!base64Chunk) {
+      function playPcmChunk(bytes) {
+        if (!bytes.length) {
           return;
         }
         const ctx = ensureAudioContext();
-        const binary = atob(base64Chunk);
-        const buffer = new ArrayBuffer(binary.length);
-        const bytes = new Uint8Array(buffer);
-        for (let i = 0; i < binary.length; i += 1) {
-          bytes[i] = binary.charCodeAt(i);
-        }
 
-        const sampleCount = bytes.length / 2;
+        // PCM16 arrives little-endian, which matches every browser platform.
+        const sampleCount = bytes.length >> 1;
+        const int16 = new Int16Array(bytes.buffer, bytes.byteOffset, sampleCount);
         const floatSamples = new Float32Array(sampleCount);
-        const view = new DataView(buffer);
+        const scale = 1 / 32768;
         for (let i = 0; i < sampleCount; i += 1) {
-          const sample = view.getInt16(i * 2, true);
-          floatSamples[i] = sample / 32768;
+          floatSamples[i] = int16[i] * scale;
         }
 
         const audioBuffer = ctx.createBuffer(1, sampleCount, ctx.sampleRate);
@@ -117,9 +189,11 @@ INDEX_HTML = """
         statusEl.textContent = 'Disconnected';
       });
 
-      socket.addEventListener('message', (event) => {
-        const data = JSON.parse(event.data);
+      function handleMessage(data) {
         switch (data.type) {
+          case 'batch':
+            data.items.forEach(handleMessage);
+            break;
           case 'text-delta':
             responseEl.textContent += data.value ?? '';
             break;
@@ -132,11 +206,6 @@ INDEX_HTML = """
           case 'transcript-reset':
             transcriptEl.textContent = '';
             break;
-          case 'audio-chunk':
-            audioBytes += (data.bytes || 0);
-            audioEl.textContent = `Audio bytes: ${audioBytes}`;
-            playPcmChunk(data.value);
-            break;
           case 'status':
             statusEl.textContent = data.message;
             break;
@@ -146,6 +215,26 @@ INDEX_HTML = """
           default:
             break;
         }
+      }
+
+      function handleBinary(buffer) {
+        const view = new Uint8Array(buffer);
+        if (view[0] !== AUDIO_FRAME_TAG) {
+          return;
+        }
+        // Copy past the tag byte so the samples start on an Int16 boundary.
+        const pcm = new Uint8Array(buffer.slice(1));
+        audioBytes += pcm.length;
+        audioEl.textContent = `Audio bytes: ${audioBytes}`;
+        playPcmChunk(pcm);
+      }
+
+      socket.addEventListener('message', (event) => {
+        if (event.data instanceof ArrayBuffer) {
+          handleBinary(event.data);
+          return;
+        }
+        handleMessage(JSON.parse(event.data));
       });
 
       form.addEventListener('submit', (event) => {
@@ -199,84 +288,227 @@ def _get_client() -> tuple[AsyncAzureOpenAI, str]:
     return _client, _deployment_name
 
 
-async def _relay_to_azure(websocket: WebSocket, user_text: str) -> None:
+@contextlib.contextmanager
+def _corked(websocket: WebSocket):
+    """Hold a group of frames in the kernel and send them as full TCP segments."""
+    sock = websocket.scope.get('state', {}).get('tcp_socket')
+    cork = getattr(socket, 'TCP_CORK', None)
+    if sock is None or cork is None:
+        yield
+        return
+    try:
+        sock.setsockopt(socket.IPPROTO_TCP, cork, 1)
+    except OSError:
+        yield
+        return
+    try:
+        yield
+    finally:
+        with contextlib.suppress(OSError):
+            sock.setsockopt(socket.IPPROTO_TCP, cork, 0)
+
+
+async def _send(websocket: WebSocket, message: dict[str, Any]) -> None:
+    await websocket.send_text(orjson.dumps(message).decode())
+
+
+class DeltaCoalescer:
+    """Buffers streaming deltas and flushes them as `batch` and binary audio frames."""
+
+    def __init__(self, websocket: WebSocket) -> None:
+        self._websocket = websocket
+        self._items: deque[dict[str, Any] | bytes] = deque()
+        self._size = 0
+        self._lock = asyncio.Lock()
+        self._closing = asyncio.Event()
+        self._task: asyncio.Task[None] | None = None
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def _run(self) -> None:
+        while not self._closing.is_set():
+            with contextlib.suppress(TimeoutError):
+                async with asyncio.timeout(BATCH_FLUSH_INTERVAL_SECONDS):
+                    await self._closing.wait()
+            try:
+                await self.flush()
+            except Exception as exc:
+                logger.warning("batch.flush_failed error=%s", exc)
+                return
+
+    async def push(self, item: dict[str, Any] | bytes, size: int) -> None:
+        self._items.append(item)
+        self._size += size
+        if self._size >= BATCH_MAX_BYTES:
+            await self.flush()
+
+    async def flush(self) -> None:
+        async with self._lock:
+            if not self._items:
+                return
+            items = list(self._items)
+            self._items.clear()
+            self._size = 0
+            # Contiguous PCM chunks are joined into one binary frame; everything else
+            # between them goes out as a single JSON batch, preserving event order.
+            with _corked(self._websocket):
+                for is_audio, group in groupby(items, key=lambda item: isinstance(item, bytes)):
+                    if is_audio:
+                        await self._websocket.send_bytes(AUDIO_FRAME_TAG + b''.join(group))
+                    else:
+                        await _send(self._websocket, {'type': 'batch', 'items': list(group)})
+
+    async def send(self, message: dict[str, Any]) -> None:
+        """Send a control message immediately, after any buffered deltas."""
+        await self.flush()
+        async with self._lock:
+            await _send(self._websocket, message)
+
+    async def close(self) -> None:
+        # Stop the timer rather than cancelling it, so a flush that already took
+        # items off the buffer finishes sending them before the final flush.
+        self._closing.set()
+        if self._task is not None:
+            await self._task
+            self._task = None
+        await self.flush()
+
+
+async def _on_text_delta(coalescer: DeltaCoalescer, event: Any) -> None:
+    delta = event.delta
+    if not delta:
+        return
+    await coalescer.push({'type': 'text-delta', 'value': delta}, len(delta))
+
+
+async def _on_audio_delta(coalescer: DeltaCoalescer, event: Any) -> None:
+    chunk = event.delta
+    if not chunk:
+        return
+    pcm = base64.b64decode(chunk)
+    await coalescer.push(pcm, len(pcm))
+
+
+async def _on_transcript_delta(coalescer: DeltaCoalescer, event: Any) -> None:
+    delta = event.delta
+    if not delta:
+        return
+    await coalescer.push({'type': 'transcript-delta', 'value': delta}, len(delta))
+
+
+async def _on_text_done(coalescer: DeltaCoalescer, event: Any) -> None:
+    await coalescer.send({'type': 'status', 'message': 'Response complete'})
+
+
+# Per-event dispatch table for the relay loop; response.done ends the turn and is handled inline.
+_EVENT_HANDLERS: dict[str, Callable[[DeltaCoalescer, Any], Awaitable[None]]] = {
+    'response.text.delta': _on_text_delta,
+    'response.audio.delta': _on_audio_delta,
+    'response.audio_transcript.delta': _on_transcript_delta,
+    'response.text.done': _on_text_done,
+}
+
+
+def _user_message_event(user_text: str) -> dict[str, Any]:
+    return {
+        'type': 'conversation.item.create',
+        'item': {
+            'type': 'message',
+            'role': 'user',
+            'content': [{'type': 'input_text', 'text': user_text}],
+        },
+    }
+
+
+async def _open_realtime(stack: contextlib.AsyncExitStack, websocket: WebSocket) -> Any:
     client, deployment = _get_client()
-    print(f"Relaying to Azure OpenAI deployment '{deployment}': {user_text}, {client._azure_endpoint}, {client._api_version}")
-    await websocket.send_json({'type': 'status', 'message': 'Connecting to Azure OpenAI...'})
+    logger.info("Connecting to Azure OpenAI deployment '%s': %s, %s", deployment, client._azure_endpoint, client._api_version)
+    await _send(websocket, {'type': 'status', 'message': 'Connecting to Azure OpenAI...'})
+    # Audio deltas are base64 PCM; permessage-deflate on them is CPU spent for little gain.
+    connection = await stack.enter_async_context(
+        client.realtime.connect(model=deployment, websocket_connection_options={'compression': None})
+    )
+    await connection.send(SESSION_UPDATE_EVENT)
+    return connection
+
+
+async def _relay_to_azure(websocket: WebSocket, connection: Any, user_text: str) -> None:
+    logger.debug("Relaying to Azure OpenAI: %s", user_text)
+    coalescer = DeltaCoalescer(websocket)
     try:
-        async with client.realtime.connect(model=deployment) as connection:
-            await connection.session.update(session={
-              'instructions': 'You are a helpful assistant. You respond by voice and text.',
-              'output_modalities': ['text', 'audio'],
-              'audio': {
-                'input': {
-                  'transcription': {'model': 'whisper-1'},
-                  'format': {'type': 'audio/pcm', 'rate': 24000},
-                  'turn_detection': {
-                      'type': 'server_vad',
-                      'threshold': 0.5,
-                      'prefix_padding_ms': 300,
-                      'silence_duration_ms': 200,
-                      'create_response': True,
-                  },
-                },
-                'output': {
-                  'voice': 'alloy',
-                  'format': {'type': 'audio/pcm', 'rate': 24000},
-                },
-              },
-            })
-
-            await connection.conversation.item.create(
-                item={
-                    'type': 'message',
-                    'role': 'user',
-                    'content': [{'type': 'input_text', 'text': user_text}],
-                }
-            )
-            await websocket.send_json({'type': 'text-reset'})
-            await websocket.send_json({'type': 'transcript-reset'})
-            await connection.response.create()
-
-            async for event in connection:
-              print(f"Received event: {event.type}")  # デバッグ用
-              if event.type == 'response.text.delta':
-                await websocket.send_json({'type': 'text-delta', 'value': event.delta})
-              elif event.type == 'response.audio.delta':
-                chunk = event.delta or ''
-                if not chunk:
-                  continue
-                raw_bytes = base64.b64decode(chunk)
-                await websocket.send_json({'type': 'audio-chunk', 'value': chunk, 'bytes': len(raw_bytes)})
-              elif event.type == 'response.audio_transcript.delta':
-                await websocket.send_json({'type': 'transcript-delta', 'value': event.delta})
-              elif event.type == 'response.text.done':
-                await websocket.send_json({'type': 'status', 'message': 'Response complete'})
-              elif event.type == 'response.done':
-                await websocket.send_json({'type': 'status', 'message': 'Model ready'})
-                break
-    except Exception as exc:  # pragma: no cover - network failures are environment specific
-        await websocket.send_json({'type': 'error', 'message': f'Azure OpenAI error: {exc}'})
+        await connection.send(_user_message_event(user_text))
+        with _corked(websocket):
+            await websocket.send_text(TEXT_RESET_FRAME)
+            await websocket.send_text(TRANSCRIPT_RESET_FRAME)
+        await connection.send(RESPONSE_CREATE_EVENT)
+
+        coalescer.start()
+        async for event in connection:
+          logger.debug("Received event: %s", event.type)
+          handler = _EVENT_HANDLERS.get(event.type)
+          if handler is not None:
+            await handler(coalescer, event)
+          elif event.type == 'response.done':
+            await coalescer.send({'type': 'status', 'message': 'Model ready'})
+            break
+    finally:
+        await coalescer.close()
 
 
-@app.get('/', response_class=HTMLResponse)
-async def index() -> HTMLResponse:
+def _on_signal(sig: signal.Signals, previous: Any) -> None:
+    revision = os.getenv('CONTAINER_APP_REVISION', 'local')
+    logger.info("signal.received signal=%s revision=%s", sig.name, revision)
+    # Chain to the server's own handler so uvicorn still drains and exits.
+    if callable(previous):
+        previous(sig, None)
+        return
+    # SIG_DFL / SIG_IGN (or None for a handler not set from Python) are not
+    # callable: restore the disposition and re-deliver the signal so the process
+    # still terminates (or ignores it) as it would have without this hook.
+    asyncio.get_running_loop().remove_signal_handler(sig)
+    signal.signal(sig, signal.SIG_DFL if previous is None else previous)
+    signal.raise_signal(sig)
+
+
+@app.on_event('startup')
+async def _register_signal_handlers() -> None:
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        previous = signal.getsignal(sig)
+        with contextlib.suppress(NotImplementedError, RuntimeError):
+            loop.add_signal_handler(sig, _on_signal, sig, previous)
+
+
+@app.on_event('shutdown')
+async def _close_shared_clients() -> None:
+    await close_shared_clients()
+
+
+def _render_index() -> bytes:
     agw_host = os.getenv('APPLICATION_GATEWAY_HOST', '')
     if agw_host:
         protocol = 'wss' if agw_host.startswith('https://') else 'ws'
         agw_host = agw_host.replace('https://', '').replace('http://', '')
         ws_endpoint = f'{protocol}://{agw_host}/chat'
+        html_content = INDEX_HTML.replace('{{WS_ENDPOINT}}', ws_endpoint)
+        logger.info("Serving index with WS endpoint: %s", ws_endpoint)
     else:
-        ws_endpoint = '${protocol}://${location.host}/chat'
         html_content = INDEX_HTML.replace(
             "const wsEndpoint = '{{WS_ENDPOINT}}';",
             "const protocol = location.protocol === 'https:' ? 'wss' : 'ws';\n      const wsEndpoint = `${protocol}://${location.host}/chat`;"
         )
-        return HTMLResponse(html_content)
-    
-    html_content = INDEX_HTML.replace('{{WS_ENDPOINT}}', ws_endpoint)
-    print(f"Serving index with WS endpoint: {ws_endpoint}")
-    return HTMLResponse(html_content)
+    return html_content.encode('utf-8')
+
+
+# APPLICATION_GATEWAY_HOST is fixed for the lifetime of the process, so the page is
+# rendered and compressed once.
+_INDEX_VARIANTS = compress_variants(_render_index())
+
+
+@app.get('/', response_class=HTMLResponse)
+async def index(request: Request) -> Response:
+    return precompressed_response(_INDEX_VARIANTS, request.headers.get('accept-encoding', ''))
 
 
 @app.get('/healthz')
@@ -288,24 +520,65 @@ async def healthz() -> JSONResponse:
 @app.websocket('/chat')
 async def chat(websocket: WebSocket) -> None:
     await websocket.accept()
+    # The Azure realtime session is opened on the first turn and reused for the
+    # rest of this socket, so later turns skip the TLS handshake and session.update.
+    stack = contextlib.AsyncExitStack()
+    connection: Any = None
     try:
         while True:
             raw = await websocket.receive_text()
-            print(f"Received from client: {raw}")
+            logger.debug("Received from client: %s", raw)
             try:
-                payload: Any = json.loads(raw)
-            except json.JSONDecodeError:
-                await websocket.send_json({'type': 'error', 'message': 'Messages must be JSON'})
+                payload: Any = orjson.loads(raw)
+            except orjson.JSONDecodeError:
+                await _send(websocket, {'type': 'error', 'message': 'Messages must be JSON'})
                 continue
 
             user_text = (payload.get('text') or '').strip()
             if not user_text:
-                await websocket.send_json({'type': 'error', 'message': 'Provide text input'})
+                await _send(websocket, {'type': 'error', 'message': 'Provide text input'})
                 continue
 
-            await _relay_to_azure(websocket, user_text)
+            try:
+                if connection is None:
+                    connection = await _open_realtime(stack, websocket)
+                await _relay_to_azure(websocket, connection, user_text)
+            except WebSocketDisconnect:
+                raise
+            except Exception as exc:  # pragma: no cover - network failures are environment specific
+                # Drop the upstream session so the next turn reconnects cleanly.
+                connection = None
+                with contextlib.suppress(Exception):
+                    await stack.aclose()
+                await _send(websocket, {'type': 'error', 'message': f'Azure OpenAI error: {exc}'})
     except WebSocketDisconnect:
         pass
     finally:
         with contextlib.suppress(Exception):
-            await websocket.close()
\ No newline at end of file
+            await stack.aclose()
+        with contextlib.suppress(Exception):
+            await websocket.close()
+
+
+if __name__ == '__main__':
+    import uvicorn
+
+    from src.ws_protocol import BufferedWebSocketProtocol
+
+    # Each worker owns its own Azure client and sideband session store, so a
+    # sideband session must be served end-to-end by the worker that created it.
+    workers = int(os.getenv('UVICORN_WORKERS', os.getenv('WEB_CONCURRENCY', '1')))
+    uvicorn.run(
+        'src.main:app',
+        host='0.0.0.0',
+        port=int(os.getenv('PORT', '8080')),
+        workers=workers,
+        # 'auto' picks uvloop when it is installed; requirements.txt skips it on Windows
+        loop='auto',
+        http='httptools',
+        # uvicorn's --ws option only accepts its built-in names, so the custom
+        # protocol class can only be selected from Python
+        ws=BufferedWebSocketProtocol,
+        ws_max_size=16 * 1024 * 1024,
+        ws_per_message_deflate=False,
+    )
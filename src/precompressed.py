@@ -0,0 +1,45 @@
+"""
+Precompressed responses for the static HTML pages.
+
+The demo pages are fixed for the lifetime of the process, so each one is
+compressed once with Brotli and gzip and the variant matching the request's
+Accept-Encoding is served as-is.
+"""
+
+import gzip
+
+import brotli
+from fastapi.responses import Response
+
+
+def compress_variants(body: bytes) -> dict[str, bytes]:
+    """Return the body keyed by content coding: br, gzip and identity."""
+    return {
+        'br': brotli.compress(body, quality=11),
+        'gzip': gzip.compress(body, compresslevel=9),
+        'identity': body,
+    }
+
+
+def preferred_encoding(accept_encoding: str) -> str:
+    accepted = set()
+    refused = set()
+    for part in accept_encoding.lower().replace(' ', '').split(','):
+        coding, _, quality = part.partition(';q=')
+        if quality and quality.strip('0.') == '':
+            refused.add(coding)  # q=0 explicitly refuses the coding
+        else:
+            accepted.add(coding)
+    for coding in ('br', 'gzip'):
+        if coding in accepted or ('*' in accepted and coding not in refused):
+            return coding
+    return 'identity'
+
+
+def precompressed_response(variants: dict[str, bytes], accept_encoding: str, media_type: str = 'text/html') -> Response:
+    """Serve the variant negotiated from an Accept-Encoding header value."""
+    encoding = preferred_encoding(accept_encoding)
+    headers = {'Vary': 'Accept-Encoding'}
+    if encoding != 'identity':
+        headers['Content-Encoding'] = encoding
+    return Response(content=variants[encoding], media_type=media_type, headers=headers)
@@ -17,19 +17,30 @@ Supports both:
 
 import asyncio
 import contextlib
-import json
+import logging
 import os
 import secrets
+import ssl
 import time
 from dataclasses import dataclass, field
 from datetime import datetime
+from functools import lru_cache
 from typing import Any
 
+import aiohttp
 import httpx
-from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect
-from fastapi.responses import HTMLResponse, JSONResponse
+import orjson
+from fastapi import FastAPI, HTTPException, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import HTMLResponse, JSONResponse, Response
 from pydantic import BaseModel
 
+from src.precompressed import compress_variants, precompressed_response
+
+
+# Records propagate to the root logger; the host app configures its handlers and
+# level (src/main.py routes them through a QueueHandler off the event loop).
+logger = logging.getLogger("sideband")
+
 
 # Session tracking for demonstrating session separation
 @dataclass
@@ -45,8 +56,28 @@ class SidebandSession:
     events_from_openai: int = 0
     events_to_openai: int = 0
     last_event_type: str = ""
-    last_activity: datetime = field(default_factory=datetime.now)
+    last_activity: float = field(default_factory=time.monotonic)  # time.monotonic() of the last event
     provider: str = ""  # "azure" or "openai"
+    ephemeral_key_task: asyncio.Task[str] | None = field(default=None, repr=False)
+    ephemeral_key_requested_at: float = 0.0  # time.monotonic() when the prefetch started
+    created_at_iso: str = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self.created_at_iso = self.created_at.isoformat()
+
+    def to_dict(self) -> dict[str, Any]:
+        """Session summary for the monitoring endpoints."""
+        return {
+            'session_id': self.session_id,
+            'call_id': self.call_id,
+            'created_at': self.created_at_iso,
+            'webrtc_connected': self.webrtc_connected,
+            'websocket_connected': self.websocket_connected,
+            'events_from_openai': self.events_from_openai,
+            'events_to_openai': self.events_to_openai,
+            'last_event_type': self.last_event_type,
+            'last_activity': _monotonic_isoformat(self.last_activity),
+        }
 
 
 class EphemeralKeyRequest(BaseModel):
@@ -63,84 +94,397 @@ class WebRTCOfferRequest(BaseModel):
     session_id: str
 
 
+# Ephemeral keys are short-lived (about a minute on OpenAI), so a prefetched key
+# older than this is discarded in favor of a fresh one.
+EPHEMERAL_KEY_PREFETCH_MAX_AGE_SECONDS = 30.0
+
+# The sideband control channel carries JSON events only (audio stays on WebRTC),
+# so permessage-deflate is offered upstream; the server may still decline it.
+SIDEBAND_DEFLATE_WBITS = 15
+
+# Upstream WebSocket connection setup for the sideband control channel
+SIDEBAND_DNS_CACHE_SECONDS = 60
+SIDEBAND_CONNECT_TIMEOUT_SECONDS = 5.0
+SIDEBAND_CLOSE_TIMEOUT_SECONDS = 2.0
+
+# Forwarded OpenAI events are batched into JSON-array frames for the browser
+CLIENT_BATCH_INTERVAL_SECONDS = 0.005
+CLIENT_BATCH_MAX_FRAMES = 32
+
+# OpenAI event types worth a log line in the relay loop
+_LOGGED_OPENAI_EVENTS = frozenset({
+    "session.created",
+    "session.updated",
+    "conversation.item.created",
+    "response.created",
+    "response.done",
+    "input_audio_buffer.speech_started",
+    "input_audio_buffer.speech_stopped",
+})
+
+# Static error frames sent on the control WebSocket
+_ERROR_SESSION_NOT_FOUND_FRAME = orjson.dumps({"type": "error", "message": "Session not found"}).decode()
+_ERROR_WEBRTC_NOT_CONNECTED_FRAME = orjson.dumps(
+    {"type": "error", "message": "WebRTC not connected yet. No call_id available."}
+).decode()
+
+# Audio deltas are forwarded to the browser as type-only events
+_AUDIO_DELTA_EVENTS = frozenset({"response.audio.delta", "response.output_audio.delta"})
+_AUDIO_DELTA_FRAMES = {
+    event_type: f'{{"type":"openai_event","event":{{"type":"{event_type}"}}}}'
+    for event_type in _AUDIO_DELTA_EVENTS
+}
+
+SESSION_REAP_INTERVAL_SECONDS = 60
+
 # In-memory session store (for demonstration)
 _sessions: dict[str, SidebandSession] = {}
 _websocket_connections: dict[str, WebSocket] = {}
+_reaper_task: asyncio.Task[None] | None = None
 
 
-def _is_azure_openai() -> bool:
-    """Check if Azure OpenAI is configured."""
-    return bool(os.getenv("AZURE_OPENAI_ENDPOINT"))
+def _monotonic_isoformat(value: float) -> str:
+    """Convert a time.monotonic() reading to a wall-clock ISO 8601 string."""
+    return datetime.fromtimestamp(time.time() - (time.monotonic() - value)).isoformat()
 
 
-def _get_azure_resource() -> str:
-    """Extract Azure resource name from endpoint."""
-    endpoint = os.getenv("AZURE_OPENAI_ENDPOINT", "")
-    # https://myresource.openai.azure.com/ -> myresource
-    if endpoint:
-        endpoint = endpoint.rstrip("/")
-        if ".openai.azure.com" in endpoint:
-            return endpoint.replace("https://", "").replace(".openai.azure.com", "")
-    return ""
+def _reap_idle_sessions() -> int:
+    """Drop sessions whose last activity is older than the configured session TTL."""
+    cutoff = time.monotonic() - _config().session_ttl_seconds
+    expired = [
+        session_id
+        for session_id, session in _sessions.items()
+        if not session.websocket_connected and session.last_activity < cutoff
+    ]
+    for session_id in expired:
+        session = _sessions.pop(session_id)
+        if session.ephemeral_key_task is not None:
+            session.ephemeral_key_task.cancel()
+    return len(expired)
 
 
-def _get_api_key() -> str:
-    """Get API key from environment."""
-    if _is_azure_openai():
-        key = os.getenv("AZURE_OPENAI_API_KEY")
-        if not key:
-            raise RuntimeError("AZURE_OPENAI_API_KEY is required for Azure OpenAI")
-        return key
-    else:
-        key = os.getenv("OPENAI_API_KEY")
-        if not key:
+async def _run_session_reaper() -> None:
+    while True:
+        await asyncio.sleep(SESSION_REAP_INTERVAL_SECONDS)
+        if removed := _reap_idle_sessions():
+            logger.info("session.reaped count=%d", removed)
+
+
+def _ensure_session_reaper() -> None:
+    """Start the background reaper on first use (the host app owns the lifecycle)."""
+    global _reaper_task
+    if _reaper_task is None or _reaper_task.done():
+        _reaper_task = asyncio.create_task(_run_session_reaper())
+
+
+# Shared upstream clients so repeat calls reuse pooled keep-alive connections
+_http_client: httpx.AsyncClient | None = None
+_ws_session: aiohttp.ClientSession | None = None
+_SSL_CONTEXT = ssl.create_default_context()
+
+
+def _get_http_client() -> httpx.AsyncClient:
+    """Get the shared httpx client used for OpenAI REST calls."""
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            timeout=30.0,
+            limits=httpx.Limits(max_keepalive_connections=100, max_connections=200),
+        )
+    return _http_client
+
+
+def _get_ws_session() -> aiohttp.ClientSession:
+    """Get the shared aiohttp session used for upstream WebSocket connections."""
+    global _ws_session
+    if _ws_session is None or _ws_session.closed:
+        # One connector for all sideband sessions: DNS answers are cached for
+        # SIDEBAND_DNS_CACHE_SECONDS and the TLS context is shared. Control channels
+        # are long-lived, so the connector's connection cap is lifted.
+        connector = aiohttp.TCPConnector(
+            limit=0,
+            ttl_dns_cache=SIDEBAND_DNS_CACHE_SECONDS,
+            ssl=_SSL_CONTEXT,
+        )
+        _ws_session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=None, sock_connect=SIDEBAND_CONNECT_TIMEOUT_SECONDS),
+        )
+    return _ws_session
+
+
+async def close_shared_clients() -> None:
+    """Close shared upstream clients and background tasks. Call from the host app's shutdown hook."""
+    global _http_client, _ws_session, _reaper_task
+    if _reaper_task is not None:
+        _reaper_task.cancel()
+        _reaper_task = None
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+    if _ws_session is not None:
+        await _ws_session.close()
+        _ws_session = None
+
+
+@dataclass(frozen=True)
+class SidebandConfig:
+    """Provider settings resolved once from the environment."""
+
+    is_azure: bool
+    api_key: str
+    base_url: str
+    model: str
+    azure_resource: str
+    auth_headers: dict[str, str]
+    json_headers: dict[str, str]  # auth_headers plus a JSON Content-Type
+    ws_headers: dict[str, str]
+    ws_url_template: str  # formatted with call_id
+    use_stun: bool  # whether the browser should gather server-reflexive candidates
+    session_ttl_seconds: int  # idle sessions without a live control channel are evicted after this long
+
+    @property
+    def provider(self) -> str:
+        return "azure" if self.is_azure else "openai"
+
+    def require_api_key(self) -> None:
+        """Raise if the API key for the configured provider is missing."""
+        if not self.api_key:
+            if self.is_azure:
+                raise RuntimeError("AZURE_OPENAI_API_KEY is required for Azure OpenAI")
             raise RuntimeError("OPENAI_API_KEY is required")
-        return key
 
 
-def _get_base_url() -> str:
-    """Get base URL for API calls."""
-    if _is_azure_openai():
-        endpoint = os.getenv("AZURE_OPENAI_ENDPOINT", "").rstrip("/")
-        return f"{endpoint}/openai"
-    else:
-        return "https://api.openai.com"
+@lru_cache(maxsize=1)
+def _config() -> SidebandConfig:
+    """Build the provider configuration from environment variables (cached)."""
+    use_stun = os.getenv("SIDEBAND_USE_STUN", "false").lower() in ("1", "true", "yes")
+    session_ttl_seconds = int(os.getenv("SIDEBAND_SESSION_TTL_SECONDS", "3600"))
+    endpoint = os.getenv("AZURE_OPENAI_ENDPOINT", "").rstrip("/")
+    if endpoint:
+        api_key = os.getenv("AZURE_OPENAI_API_KEY", "")
+        # https://myresource.openai.azure.com/ -> myresource
+        azure_resource = ""
+        if ".openai.azure.com" in endpoint:
+            azure_resource = endpoint.replace("https://", "").replace(".openai.azure.com", "")
+        auth_headers = {"api-key": api_key}
+        return SidebandConfig(
+            is_azure=True,
+            api_key=api_key,
+            base_url=f"{endpoint}/openai",
+            # Support both AZURE_OPENAI_DEPLOYMENT_NAME and legacy AZURE_OPENAI_DEPLOYMENT
+            model=os.getenv("AZURE_OPENAI_DEPLOYMENT_NAME") or os.getenv("AZURE_OPENAI_DEPLOYMENT", "gpt-4o-realtime-preview"),
+            azure_resource=azure_resource,
+            auth_headers=auth_headers,
+            json_headers={**auth_headers, "Content-Type": "application/json"},
+            ws_headers=auth_headers,
+            ws_url_template=f"wss://{azure_resource}.openai.azure.com/openai/v1/realtime?call_id={{call_id}}",
+            use_stun=use_stun,
+            session_ttl_seconds=session_ttl_seconds,
+        )
+    api_key = os.getenv("OPENAI_API_KEY", "")
+    auth_headers = {"Authorization": f"Bearer {api_key}"}
+    return SidebandConfig(
+        is_azure=False,
+        api_key=api_key,
+        base_url="https://api.openai.com",
+        model=os.getenv("OPENAI_REALTIME_MODEL", "gpt-4o-realtime-preview-2024-12-17"),
+        azure_resource="",
+        auth_headers=auth_headers,
+        json_headers={**auth_headers, "Content-Type": "application/json"},
+        ws_headers={**auth_headers, "OpenAI-Beta": "realtime=v1"},
+        ws_url_template="wss://api.openai.com/v1/realtime?call_id={call_id}",
+        use_stun=use_stun,
+        session_ttl_seconds=session_ttl_seconds,
+    )
 
 
-def _get_model() -> str:
-    """Get the realtime model/deployment to use."""
-    if _is_azure_openai():
-        # Support both AZURE_OPENAI_DEPLOYMENT_NAME and legacy AZURE_OPENAI_DEPLOYMENT
-        return os.getenv("AZURE_OPENAI_DEPLOYMENT_NAME") or os.getenv("AZURE_OPENAI_DEPLOYMENT", "gpt-4o-realtime-preview")
-    else:
-        return os.getenv("OPENAI_REALTIME_MODEL", "gpt-4o-realtime-preview-2024-12-17")
+@lru_cache(maxsize=1)
+def _sideband_html_variants() -> dict[str, bytes]:
+    """Render the sideband page for the configured provider once and cache its compressed variants."""
+    config = _config()
+    html = SIDEBAND_HTML.replace("{{IS_AZURE}}", str(config.is_azure).lower())
+    html = html.replace("{{AZURE_RESOURCE}}", config.azure_resource)
+    return compress_variants(html.encode("utf-8"))
+
+
+@lru_cache(maxsize=1)
+def _config_json_bytes() -> bytes:
+    """Serialize the public part of the provider configuration once."""
+    config = _config()
+    return orjson.dumps(
+        {
+            "provider": config.provider,
+            "azure_resource": config.azure_resource if config.is_azure else None,
+            "model": config.model,
+            "base_url": config.base_url,
+            "use_stun": config.use_stun,
+        }
+    )
 
 
-def _get_auth_headers() -> dict[str, str]:
-    """Get authentication headers based on provider."""
-    if _is_azure_openai():
-        return {"api-key": _get_api_key()}
-    else:
-        return {"Authorization": f"Bearer {_get_api_key()}"}
+def _get_json_headers() -> dict[str, str]:
+    """Get authentication plus JSON Content-Type headers for the provider."""
+    config = _config()
+    config.require_api_key()
+    return config.json_headers
 
 
 def _log_session_info(session: SidebandSession, event: str, details: str = "") -> None:
     """Log session information to demonstrate session separation."""
-    timestamp = datetime.now().isoformat()
-    separator = "=" * 60
-    print(f"\n{separator}")
-    print(f"[SIDEBAND SESSION LOG] {timestamp}")
-    print(f"  Provider: {session.provider.upper()}")
-    print(f"  Session ID: {session.session_id}")
-    print(f"  Call ID: {session.call_id}")
-    print(f"  Event: {event}")
-    if details:
-        print(f"  Details: {details}")
-    print(f"  WebRTC Connected: {session.webrtc_connected}")
-    print(f"  WebSocket (Server) Connected: {session.websocket_connected}")
-    print(f"  Events from OpenAI: {session.events_from_openai}")
-    print(f"  Events to OpenAI: {session.events_to_openai}")
-    print(f"{separator}\n")
+    logger.info(
+        "session.event session_id=%s provider=%s call_id=%s event=%r details=%r "
+        "webrtc_connected=%s websocket_connected=%s events_from_openai=%d events_to_openai=%d",
+        session.session_id, session.provider, session.call_id, event, details,
+        session.webrtc_connected, session.websocket_connected,
+        session.events_from_openai, session.events_to_openai,
+    )
+
+
+async def _fetch_call_ephemeral_key() -> str:
+    """Request an ephemeral key for the WebRTC call SDP exchange."""
+    config = _config()
+    model = config.model
+    client = _get_http_client()
+    if config.is_azure:
+        # Put API version 2025-08-28
+        key_url = f"{config.base_url}/v1/realtime/client_secrets"
+        key_headers = _get_json_headers()
+        key_payload = {
+            "session": {
+                "type": "realtime",
+                "model": model,
+                # "model": "gpt-realtime-shkinosh",
+                "instructions": "You are a helpful assistant.",
+                "audio": {"output": {"voice": "alloy"}},
+            },
+        }
+    else:
+        key_url = f"{config.base_url}/v1/realtime/sessions"
+        key_headers = _get_json_headers()
+        key_payload = {
+            "model": model,
+            "voice": "alloy",
+            "modalities": ["text", "audio"],
+        }
+
+    logger.info("ephemeral_key.request url=%s", key_url)
+    logger.debug("Ephemeral key payload: %s", key_payload)
+    key_response = await client.post(
+        key_url, headers=key_headers, json=key_payload
+    )
+
+    if key_response.status_code != 200:
+        raise HTTPException(
+            status_code=key_response.status_code,
+            detail=f"Failed to get ephemeral key: {key_response.text}",
+        )
+
+    key_data = key_response.json()
+    if config.is_azure:
+        ephemeral_key = key_data.get("value", "")
+    else:
+        ephemeral_key = key_data.get("client_secret", {}).get("value", "")
+
+    if not ephemeral_key:
+        raise HTTPException(status_code=500, detail="No ephemeral key in response")
+    return ephemeral_key
+
+
+def _prefetch_ephemeral_key(session: SidebandSession) -> None:
+    """Start fetching the call's ephemeral key while the browser gathers ICE candidates."""
+    age = time.monotonic() - session.ephemeral_key_requested_at
+    if session.ephemeral_key_task is not None and age <= EPHEMERAL_KEY_PREFETCH_MAX_AGE_SECONDS:
+        return  # a usable prefetch is already pending or ready for this session
+    if session.ephemeral_key_task is not None:
+        session.ephemeral_key_task.cancel()
+    task = asyncio.create_task(_fetch_call_ephemeral_key())
+    # Retrieve failures so an unused prefetch does not log "exception was never retrieved"
+    task.add_done_callback(lambda t: t.cancelled() or t.exception())
+    session.ephemeral_key_task = task
+    session.ephemeral_key_requested_at = time.monotonic()
+
+
+async def _take_ephemeral_key(session: SidebandSession) -> str:
+    """Use the prefetched ephemeral key if available, otherwise fetch one now."""
+    task, session.ephemeral_key_task = session.ephemeral_key_task, None
+    age = time.monotonic() - session.ephemeral_key_requested_at
+    if task is not None and age > EPHEMERAL_KEY_PREFETCH_MAX_AGE_SECONDS:
+        task.cancel()
+    elif task is not None:
+        # Only a prefetch that was cancelled or timed out is retried; an upstream
+        # rejection (HTTPException) would just be repeated, so it propagates.
+        try:
+            return await task
+        except asyncio.CancelledError:
+            if asyncio.current_task().cancelling():
+                raise  # this request itself is being cancelled
+            logger.warning("ephemeral_key.prefetch_cancelled session_id=%s", session.session_id)
+        except httpx.TimeoutException as e:
+            logger.warning("ephemeral_key.prefetch_timeout session_id=%s error=%s", session.session_id, e)
+    return await _fetch_call_ephemeral_key()
+
+
+class ClientFrameBatcher:
+    """Coalesces pre-serialized JSON frames into JSON-array frames for the browser.
+
+    A flush happens CLIENT_BATCH_INTERVAL_SECONDS after the first buffered frame,
+    or as soon as CLIENT_BATCH_MAX_FRAMES are waiting, whichever comes first.
+    """
+
+    def __init__(self, websocket: WebSocket) -> None:
+        self._websocket = websocket
+        self._frames: list[str] = []
+        self._pending = asyncio.Event()
+        self._lock = asyncio.Lock()
+        self._closing = asyncio.Event()
+        self._task: asyncio.Task[None] | None = None
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def _run(self) -> None:
+        while True:
+            await self._pending.wait()
+            if self._closing.is_set():
+                return
+            with contextlib.suppress(TimeoutError):
+                async with asyncio.timeout(CLIENT_BATCH_INTERVAL_SECONDS):
+                    await self._closing.wait()
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.warning("sideband.batch_flush_failed error=%s", e)
+                return
+
+    async def push(self, frame: str) -> None:
+        self._frames.append(frame)
+        self._pending.set()
+        if len(self._frames) >= CLIENT_BATCH_MAX_FRAMES:
+            await self.flush()
+
+    async def flush(self) -> None:
+        async with self._lock:
+            self._pending.clear()
+            if not self._frames:
+                return
+            frames, self._frames = self._frames, []
+            await self._websocket.send_text("[" + ",".join(frames) + "]")
+
+    async def close(self) -> None:
+        # Wake the timer instead of cancelling it, so frames an in-flight flush
+        # already took off the buffer are sent before the final flush.
+        self._closing.set()
+        self._pending.set()
+        if self._task is not None:
+            await self._task
+            self._task = None
+        await self.flush()
+
+
+def _openai_event_frame(raw_event: str) -> str:
+    """Wrap a raw OpenAI event in the client envelope without re-serializing it."""
+    return f'{{"type":"openai_event","event":{raw_event}}}'
 
 
 def create_sideband_app() -> FastAPI:
@@ -152,27 +496,15 @@ def create_sideband_app() -> FastAPI:
     )
 
     @app.get("/sideband", response_class=HTMLResponse)
-    async def sideband_index() -> HTMLResponse:
+    async def sideband_index(request: Request) -> Response:
         """Serve the sideband demo page."""
-        # Pass configuration to HTML
-        is_azure = _is_azure_openai()
-        azure_resource = _get_azure_resource() if is_azure else ""
-        html = SIDEBAND_HTML.replace("{{IS_AZURE}}", str(is_azure).lower())
-        html = html.replace("{{AZURE_RESOURCE}}", azure_resource)
-        return HTMLResponse(html)
+        # Configuration is baked into the cached page variants
+        return precompressed_response(_sideband_html_variants(), request.headers.get("accept-encoding", ""))
 
     @app.get("/sideband/config")
-    async def get_config() -> JSONResponse:
+    async def get_config() -> Response:
         """Get sideband configuration (which provider is being used)."""
-        is_azure = _is_azure_openai()
-        return JSONResponse(
-            {
-                "provider": "azure" if is_azure else "openai",
-                "azure_resource": _get_azure_resource() if is_azure else None,
-                "model": _get_model(),
-                "base_url": _get_base_url(),
-            }
-        )
+        return Response(content=_config_json_bytes(), media_type="application/json")
 
     @app.post("/sideband/session")
     async def create_session() -> JSONResponse:
@@ -181,7 +513,7 @@ def create_sideband_app() -> FastAPI:
         Returns session_id for the client to use.
         """
         session_id = f"sideband_{secrets.token_hex(8)}"
-        provider = "azure" if _is_azure_openai() else "openai"
+        provider = _config().provider
         session = SidebandSession(
             session_id=session_id,
             call_id="",  # Will be set after WebRTC connection
@@ -189,16 +521,12 @@ def create_sideband_app() -> FastAPI:
             provider=provider,
         )
         _sessions[session_id] = session
+        _ensure_session_reaper()
 
-        print(f"\n{'#' * 60}")
-        print(f"[NEW SIDEBAND SESSION CREATED]")
-        print(f"  Provider: {provider.upper()}")
-        print(f"  Session ID: {session_id}")
-        print(f"  Created at: {session.created_at.isoformat()}")
-        print(f"  Purpose: This session will have TWO separate connections to OpenAI:")
-        print(f"    1. WebRTC: User <-> OpenAI (direct audio/video)")
-        print(f"    2. WebSocket: Server <-> OpenAI (control channel)")
-        print(f"{'#' * 60}\n")
+        logger.info(
+            "session.created session_id=%s provider=%s created_at=%s",
+            session_id, provider, session.created_at_iso,
+        )
 
         return JSONResponse(
             {
@@ -208,6 +536,19 @@ def create_sideband_app() -> FastAPI:
             }
         )
 
+    @app.post("/sideband/session/{session_id}/prefetch-key", status_code=202)
+    async def prefetch_key(session_id: str) -> JSONResponse:
+        """
+        Start minting the call's ephemeral key ahead of the offer.
+        The page calls this when the user starts WebRTC, so the key request overlaps
+        microphone access and ICE gathering. Creating a session alone mints nothing.
+        """
+        session = _sessions.get(session_id)
+        if not session:
+            raise HTTPException(status_code=404, detail="Session not found")
+        _prefetch_ephemeral_key(session)
+        return JSONResponse({"session_id": session_id, "message": "Ephemeral key prefetch started"}, status_code=202)
+
     @app.post("/sideband/ephemeral-key")
     async def get_ephemeral_key(request: EphemeralKeyRequest) -> JSONResponse:
         """
@@ -217,79 +558,71 @@ def create_sideband_app() -> FastAPI:
         For Azure OpenAI: POST to /openai/v1/realtime/client_secrets
         For OpenAI: POST to /v1/realtime/sessions
         """
-        model = _get_model()
-        is_azure = _is_azure_openai()
-
-        print(f"\n[EPHEMERAL KEY REQUEST]")
-        print(f"  Provider: {'Azure OpenAI' if is_azure else 'OpenAI'}")
-        print(f"  Model/Deployment: {model}")
-
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            if is_azure:
-                # Azure OpenAI endpoint
-                url = f"{_get_base_url()}/v1/realtime/client_secrets"
-                headers = {
-                    **_get_auth_headers(),
-                    "Content-Type": "application/json",
-                }
-                payload = {
-                    "session": {
-                        "type": "realtime",
-                        "model": model,
-                        "instructions": request.instructions,
-                        "audio": {
-                            "output": {
-                                "voice": request.voice,
-                            },
-                        },
-                    },
-                }
-            else:
-                # OpenAI direct endpoint
-                url = f"{_get_base_url()}/v1/realtime/sessions"
-                headers = {
-                    **_get_auth_headers(),
-                    "Content-Type": "application/json",
-                }
-                payload = {
+        config = _config()
+        model = config.model
+        is_azure = config.is_azure
+
+        client = _get_http_client()
+        if is_azure:
+            # Azure OpenAI endpoint
+            url = f"{config.base_url}/v1/realtime/client_secrets"
+            headers = _get_json_headers()
+            payload = {
+                "session": {
+                    "type": "realtime",
                     "model": model,
-                    "voice": request.voice,
                     "instructions": request.instructions,
-                    "modalities": ["text", "audio"],
-                    "input_audio_transcription": {"model": "whisper-1"},
-                }
-
-            print(f"  URL: {url}")
-            print(f"  Payload: {payload}")
-            response = await client.post(url, headers=headers, json=payload)
+                    "audio": {
+                        "output": {
+                            "voice": request.voice,
+                        },
+                    },
+                },
+            }
+        else:
+            # OpenAI direct endpoint
+            url = f"{config.base_url}/v1/realtime/sessions"
+            headers = _get_json_headers()
+            payload = {
+                "model": model,
+                "voice": request.voice,
+                "instructions": request.instructions,
+                "modalities": ["text", "audio"],
+                "input_audio_transcription": {"model": "whisper-1"},
+            }
 
-            if response.status_code != 200:
-                error_detail = response.text
-                print(f"  ERROR: Failed to get ephemeral key: {error_detail}")
-                raise HTTPException(
-                    status_code=response.status_code,
-                    detail=f"Failed to get ephemeral key: {error_detail}",
-                )
+        logger.info("ephemeral_key.request provider=%s model=%s url=%s", config.provider, model, url)
+        logger.debug("Ephemeral key payload: %s", payload)
+        response = await client.post(url, headers=headers, json=payload)
 
-            data = response.json()
-
-            # Azure returns token in 'value', OpenAI returns in 'client_secret.value'
-            if is_azure:
-                token = data.get("value", "")
-                print(f"  SUCCESS: Ephemeral key obtained from Azure OpenAI")
-            else:
-                token = data.get("client_secret", {}).get("value", "")
-                print(f"  SUCCESS: Ephemeral key obtained from OpenAI")
-                print(f"  Expires at: {data.get('expires_at', 'unknown')}")
-
-            return JSONResponse(
-                {
-                    "token": token,
-                    "provider": "azure" if is_azure else "openai",
-                    "raw_response": data,
-                }
+        if response.status_code != 200:
+            error_detail = response.text
+            logger.error("ephemeral_key.failed status=%s detail=%s", response.status_code, error_detail)
+            raise HTTPException(
+                status_code=response.status_code,
+                detail=f"Failed to get ephemeral key: {error_detail}",
             )
 
+        data = response.json()
+
+        # Azure returns token in 'value', OpenAI returns in 'client_secret.value'
+        if is_azure:
+            token = data.get("value", "")
+        else:
+            token = data.get("client_secret", {}).get("value", "")
+        logger.info(
+            "ephemeral_key.obtained provider=%s expires_at=%s",
+            config.provider, data.get("expires_at", "unknown"),
+        )
+
+        return JSONResponse(
+            {
+                "token": token,
+                "provider": config.provider,
+                "raw_response": data,
+            }
+        )
+
     @app.post("/sideband/offer")
     async def exchange_offer(request: WebRTCOfferRequest) -> JSONResponse:
         """
@@ -306,122 +639,63 @@ def create_sideband_app() -> FastAPI:
         if not session:
             raise HTTPException(status_code=404, detail="Session not found")
 
-        model = _get_model()
-        is_azure = _is_azure_openai()
-
-        print(f"\n[WEBRTC OFFER EXCHANGE]")
-        print(f"  Provider: {'Azure OpenAI' if is_azure else 'OpenAI'}")
-        print(f"  Session ID: {request.session_id}")
-        print(f"  Exchanging SDP offer...")
-
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            # Step 1: Get ephemeral key
-            if is_azure:
-                # Put API version 2025-08-28
-                key_url = f"{_get_base_url()}/v1/realtime/client_secrets"
-                key_headers = {
-                    **_get_auth_headers(),
-                    "Content-Type": "application/json",
-                }
-                key_payload = {
-                    "session": {
-                        "type": "realtime",
-                        "model": model,
-                        # "model": "gpt-realtime-shkinosh",
-                        "instructions": "You are a helpful assistant.",
-                        "audio": {"output": {"voice": "alloy"}},
-                    },
-                }
-            else:
-                key_url = f"{_get_base_url()}/v1/realtime/sessions"
-                key_headers = {
-                    **_get_auth_headers(),
-                    "Content-Type": "application/json",
-                }
-                key_payload = {
-                    "model": model,
-                    "voice": "alloy",
-                    "modalities": ["text", "audio"],
-                }
+        config = _config()
 
-            print(f"  Step 1: Getting ephemeral key from {key_url}")
-            print(f"  payload: {key_payload}")
-            key_response = await client.post(
-                key_url, headers=key_headers, json=key_payload
-            )
+        logger.info("webrtc.offer session_id=%s provider=%s", request.session_id, config.provider)
 
-            if key_response.status_code != 200:
-                raise HTTPException(
-                    status_code=key_response.status_code,
-                    detail=f"Failed to get ephemeral key: {key_response.text}",
-                )
+        client = _get_http_client()
+        # Step 1: Get ephemeral key (normally prefetched when the user started WebRTC)
+        ephemeral_key = await _take_ephemeral_key(session)
+
+        # Step 2: Exchange SDP offer
+        sdp_url = f"{config.base_url}/v1/realtime/calls"
 
-            key_data = key_response.json()
-            if is_azure:
-                ephemeral_key = key_data.get("value", "")
-            else:
-                ephemeral_key = key_data.get("client_secret", {}).get("value", "")
+        sdp_headers = {
+            "Authorization": f"Bearer {ephemeral_key}",
+            "Content-Type": "application/sdp",
+        }
 
-            if not ephemeral_key:
-                raise HTTPException(status_code=500, detail="No ephemeral key in response")
+        logger.debug("webrtc.sdp_exchange session_id=%s url=%s", request.session_id, sdp_url)
+        sdp_response = await client.post(
+            sdp_url, headers=sdp_headers, content=request.sdp
+        )
 
-            print(f"  Step 1 SUCCESS: Got ephemeral key")
+        # Decode the answer (or error body) once
+        sdp_text = sdp_response.text
+        if sdp_response.status_code != 201:
+            raise HTTPException(
+                status_code=sdp_response.status_code,
+                detail=f"Failed to exchange SDP: {sdp_text}",
+            )
 
-            # Step 2: Exchange SDP offer
-            if is_azure:
-                sdp_url = f"{_get_base_url()}/v1/realtime/calls"
-            else:
-                sdp_url = f"{_get_base_url()}/v1/realtime/calls"
+        # Extract call_id from Location header
+        location = sdp_response.headers.get("Location", "")
+        call_id = location.split("/")[-1] if location else ""
 
-            sdp_headers = {
-                "Authorization": f"Bearer {ephemeral_key}",
-                "Content-Type": "application/sdp",
-            }
+        if not call_id:
+            raise HTTPException(status_code=500, detail="No call_id in response")
 
-            print(f"  Step 2: Exchanging SDP at {sdp_url}")
-            sdp_response = await client.post(
-                sdp_url, headers=sdp_headers, content=request.sdp
-            )
+        # Update session with call_id
+        session.call_id = call_id
+        session.webrtc_connected = True
+        session.provider = config.provider
 
-            if sdp_response.status_code != 201:
-                raise HTTPException(
-                    status_code=sdp_response.status_code,
-                    detail=f"Failed to exchange SDP: {sdp_response.text}",
-                )
+        logger.info(
+            "webrtc.connected session_id=%s provider=%s call_id=%s",
+            session.session_id, session.provider, call_id,
+        )
 
-            # Extract call_id from Location header
-            location = sdp_response.headers.get("Location", "")
-            call_id = location.split("/")[-1] if location else ""
-
-            if not call_id:
-                raise HTTPException(status_code=500, detail="No call_id in response")
-
-            # Update session with call_id
-            session.call_id = call_id
-            session.webrtc_connected = True
-            session.provider = "azure" if is_azure else "openai"
-
-            print(f"\n{'*' * 60}")
-            print(f"[WEBRTC CONNECTION ESTABLISHED]")
-            print(f"  Provider: {session.provider.upper()}")
-            print(f"  Session ID: {session.session_id}")
-            print(f"  Call ID: {call_id}")
-            print(f"  Location Header: {location}")
-            print(f"  This call_id allows server to connect to the SAME OpenAI session!")
-            print(f"  User audio flows directly: User <-> OpenAI via WebRTC")
-            print(f"{'*' * 60}\n")
-
-            _log_session_info(session, "WebRTC Connected", f"call_id: {call_id}")
-
-            return JSONResponse(
-                {
-                    "sdp": sdp_response.text,
-                    "call_id": call_id,
-                    "session_id": request.session_id,
-                    "provider": session.provider,
-                    "message": "WebRTC connection ready. Server can now connect via WebSocket.",
-                }
-            )
+        _log_session_info(session, "WebRTC Connected", f"call_id: {call_id}")
+
+        return JSONResponse(
+            {
+                "sdp": sdp_text,
+                "call_id": call_id,
+                "session_id": request.session_id,
+                "provider": session.provider,
+                "message": "WebRTC connection ready. Server can now connect via WebSocket.",
+            }
+        )
 
     @app.websocket("/sideband/control/{session_id}")
     async def sideband_control(websocket: WebSocket, session_id: str) -> None:
@@ -445,48 +719,39 @@ def create_sideband_app() -> FastAPI:
 
         session = _sessions.get(session_id)
         if not session:
-            await websocket.send_json({"type": "error", "message": "Session not found"})
+            await websocket.send_text(_ERROR_SESSION_NOT_FOUND_FRAME)
             await websocket.close()
             return
 
         if not session.call_id:
-            await websocket.send_json(
-                {"type": "error", "message": "WebRTC not connected yet. No call_id available."}
-            )
+            await websocket.send_text(_ERROR_WEBRTC_NOT_CONNECTED_FRAME)
             await websocket.close()
             return
 
         _websocket_connections[session_id] = websocket
 
-        is_azure = _is_azure_openai()
-        azure_resource = _get_azure_resource()
+        config = _config()
+        config.require_api_key()
+        is_azure = config.is_azure
 
         # Construct WebSocket URL based on provider
-        if is_azure:
-            openai_ws_url = f"wss://{azure_resource}.openai.azure.com/openai/v1/realtime?call_id={session.call_id}"
-            ws_headers = {"api-key": _get_api_key()}
-        else:
-            openai_ws_url = f"wss://api.openai.com/v1/realtime?call_id={session.call_id}"
-            ws_headers = {
-                "Authorization": f"Bearer {_get_api_key()}",
-                "OpenAI-Beta": "realtime=v1",
-            }
+        openai_ws_url = config.ws_url_template.format(call_id=session.call_id)
+        ws_headers = config.ws_headers
 
-        print(f"\n{'=' * 60}")
-        print(f"[SERVER SIDEBAND CONNECTION STARTING]")
-        print(f"  Provider: {'Azure OpenAI' if is_azure else 'OpenAI'}")
-        print(f"  Session ID: {session_id}")
-        print(f"  Call ID: {session.call_id}")
-        print(f"  WebSocket URL: {openai_ws_url}")
-        print(f"  Connecting server to OpenAI via WebSocket...")
-        print(f"  This is the CONTROL CHANNEL - same session as user's WebRTC!")
-        print(f"{'=' * 60}\n")
+        logger.info(
+            "sideband.connecting session_id=%s provider=%s call_id=%s url=%s",
+            session_id, config.provider, session.call_id, openai_ws_url,
+        )
 
         try:
-            import websockets
-
-            async with websockets.connect(
-                openai_ws_url, additional_headers=ws_headers
+            async with _get_ws_session().ws_connect(
+                openai_ws_url,
+                headers=ws_headers,
+                max_msg_size=0,
+                receive_timeout=None,
+                compress=SIDEBAND_DEFLATE_WBITS,
+                timeout=SIDEBAND_CLOSE_TIMEOUT_SECONDS,
+                heartbeat=20.0,
             ) as openai_ws:
                 session.websocket_connected = True
 
@@ -501,56 +766,54 @@ def create_sideband_app() -> FastAPI:
                         "type": "sideband_connected",
                         "session_id": session_id,
                         "call_id": session.call_id,
-                        "provider": "azure" if is_azure else "openai",
+                        "provider": config.provider,
                         "message": "Server connected to OpenAI session via sideband WebSocket",
                     }
                 )
 
                 async def receive_from_openai():
                     """Receive events from OpenAI and forward to client."""
+                    batcher = ClientFrameBatcher(websocket)
+                    batcher.start()
                     try:
                         async for message in openai_ws:
-                            data = json.loads(message)
+                            if message.type == aiohttp.WSMsgType.ERROR:
+                                logger.error("sideband.openai_error session_id=%s error=%s", session_id, openai_ws.exception())
+                                break
+                            if message.type != aiohttp.WSMsgType.TEXT:
+                                continue
+                            raw_event = message.data
+                            data = orjson.loads(raw_event)
                             event_type = data.get("type", "unknown")
 
                             session.events_from_openai += 1
                             session.last_event_type = event_type
-                            session.last_activity = datetime.now()
-
-                            # Log interesting events
-                            if event_type in [
-                                "session.created",
-                                "session.updated",
-                                "conversation.item.created",
-                                "response.created",
-                                "response.done",
-                                "input_audio_buffer.speech_started",
-                                "input_audio_buffer.speech_stopped",
-                            ]:
-                                _log_session_info(
-                                    session,
-                                    f"Event from OpenAI: {event_type}",
-                                    f"Server sees this via sideband, user's audio flows via WebRTC",
-                                )
+                            session.last_activity = time.monotonic()
 
-                            # Forward to client websocket
-                            await websocket.send_json({
-                                'type': 'openai_event',
-                                'event': data,
-                                'stats': {
-                                    'events_from_openai': session.events_from_openai,
-                                    'events_to_openai': session.events_to_openai
-                                }
-                            })
+                            # Log interesting events (full session snapshots are only
+                            # logged on connect/disconnect to keep this loop cheap)
+                            if event_type in _LOGGED_OPENAI_EVENTS:
+                                logger.debug("sideband.openai_event session_id=%s type=%s", session_id, event_type)
+
+                            # Forward to client websocket; audio deltas go without
+                            # their base64 payload, which the page never reads
+                            if event_type in _AUDIO_DELTA_EVENTS:
+                                await batcher.push(_AUDIO_DELTA_FRAMES[event_type])
+                            else:
+                                await batcher.push(_openai_event_frame(raw_event))
+                        logger.info("sideband.openai_closed session_id=%s code=%s", session_id, openai_ws.close_code)
                     except Exception as e:
-                        print(f"[ERROR] Receiving from OpenAI: {e}")
+                        logger.error("sideband.openai_error session_id=%s error=%s", session_id, e)
+                    finally:
+                        with contextlib.suppress(Exception):
+                            await batcher.close()
                 
                 async def receive_from_client():
                     """Receive commands from client and forward to OpenAI."""
                     try:
                         while True:
                             raw = await websocket.receive_text()
-                            data = json.loads(raw)
+                            data = orjson.loads(raw)
                             
                             # Handle different command types
                             cmd_type = data.get('type', '')
@@ -562,7 +825,7 @@ def create_sideband_app() -> FastAPI:
                                     "Sending session.update via sideband",
                                     f"Instructions: {data.get('session', {}).get('instructions', '')[:50]}..."
                                 )
-                                await openai_ws.send(json.dumps(data))
+                                await openai_ws.send_str(raw)
                                 
                             elif cmd_type == 'conversation.item.create':
                                 session.events_to_openai += 1
@@ -571,7 +834,7 @@ def create_sideband_app() -> FastAPI:
                                     "Server adding item to conversation",
                                     "Server can inject messages even while user talks via WebRTC"
                                 )
-                                await openai_ws.send(json.dumps(data))
+                                await openai_ws.send_str(raw)
                                 
                             elif cmd_type == 'response.create':
                                 session.events_to_openai += 1
@@ -580,27 +843,30 @@ def create_sideband_app() -> FastAPI:
                                     "Server triggering response",
                                     "Server can trigger AI responses independently of user input"
                                 )
-                                await openai_ws.send(json.dumps(data))
+                                await openai_ws.send_str(raw)
                                 
                             else:
                                 # Forward any other events
                                 session.events_to_openai += 1
-                                await openai_ws.send(json.dumps(data))
+                                await openai_ws.send_str(raw)
                                 
                     except WebSocketDisconnect:
-                        print(f"[INFO] Client disconnected from sideband: {session_id}")
+                        logger.info("sideband.client_disconnected session_id=%s", session_id)
+                    except ConnectionResetError:
+                        logger.info("sideband.openai_closed session_id=%s code=%s", session_id, openai_ws.close_code)
                     except Exception as e:
-                        print(f"[ERROR] Receiving from client: {e}")
+                        logger.error("sideband.client_error session_id=%s error=%s", session_id, e)
                 
-                # Run both tasks concurrently
-                await asyncio.gather(
-                    receive_from_openai(),
-                    receive_from_client(),
-                    return_exceptions=True
-                )
+                # Run both directions concurrently; whichever side ends first
+                # cancels the other so half-closed bridges are torn down promptly
+                async with asyncio.TaskGroup() as tg:
+                    openai_task = tg.create_task(receive_from_openai())
+                    client_task = tg.create_task(receive_from_client())
+                    openai_task.add_done_callback(lambda _: client_task.cancel())
+                    client_task.add_done_callback(lambda _: openai_task.cancel())
                 
         except Exception as e:
-            print(f"[ERROR] Sideband connection failed: {e}")
+            logger.error("sideband.connect_failed session_id=%s error=%s", session_id, e)
             await websocket.send_json({
                 'type': 'error',
                 'message': f'Failed to connect to OpenAI: {str(e)}'
@@ -613,44 +879,22 @@ def create_sideband_app() -> FastAPI:
                 await websocket.close()
 
     @app.get('/sideband/sessions')
-    async def list_sessions() -> JSONResponse:
+    async def list_sessions() -> Response:
         """List all active sideband sessions for monitoring."""
-        sessions_data = []
-        for session_id, session in _sessions.items():
-            sessions_data.append({
-                'session_id': session.session_id,
-                'call_id': session.call_id,
-                'created_at': session.created_at.isoformat(),
-                'webrtc_connected': session.webrtc_connected,
-                'websocket_connected': session.websocket_connected,
-                'events_from_openai': session.events_from_openai,
-                'events_to_openai': session.events_to_openai,
-                'last_event_type': session.last_event_type,
-                'last_activity': session.last_activity.isoformat()
-            })
-        return JSONResponse({
-            'sessions': sessions_data,
-            'total': len(sessions_data)
-        })
+        sessions_data = [session.to_dict() for session in _sessions.values()]
+        return Response(
+            content=orjson.dumps({'sessions': sessions_data, 'total': len(sessions_data)}),
+            media_type="application/json",
+        )
 
     @app.get('/sideband/session/{session_id}')
-    async def get_session(session_id: str) -> JSONResponse:
+    async def get_session(session_id: str) -> Response:
         """Get details of a specific sideband session."""
         session = _sessions.get(session_id)
         if not session:
             raise HTTPException(status_code=404, detail="Session not found")
         
-        return JSONResponse({
-            'session_id': session.session_id,
-            'call_id': session.call_id,
-            'created_at': session.created_at.isoformat(),
-            'webrtc_connected': session.webrtc_connected,
-            'websocket_connected': session.websocket_connected,
-            'events_from_openai': session.events_from_openai,
-            'events_to_openai': session.events_to_openai,
-            'last_event_type': session.last_event_type,
-            'last_activity': session.last_activity.isoformat()
-        })
+        return Response(content=orjson.dumps(session.to_dict()), media_type="application/json")
 
     return app
 
@@ -753,6 +997,8 @@ SIDEBAND_HTML = """
             font-family: 'Consolas', 'Monaco', monospace;
             font-size: 0.85rem;
             line-height: 1.4;
+            /* Log updates never affect layout outside the fixed-height panel */
+            contain: strict;
         }
         .log-entry { margin-bottom: 0.25rem; }
         .log-entry.info { color: #81d4fa; }
@@ -857,17 +1103,45 @@ SIDEBAND_HTML = """
         let sessionId = null;
         let callId = null;
         let provider = null;
+        let useStun = false;
         let peerConnection = null;
         let localStream = null;
         let dataChannel = null;
         let controlWebSocket = null;
+        // Aborts any in-flight setup request when the page is left
+        const sidebandAbort = new AbortController();
+        
+        // Target jitter buffer delay for received audio. 0 lets the browser play
+        // as early as possible; raise to 40-80 ms if playback underruns.
+        const JITTER_BUFFER_TARGET_MS = 0;
+        
+        // Elements updated on every status change or log flush, looked up once
+        const EL = Object.freeze({
+            sessionId: document.getElementById('session-id'),
+            callId: document.getElementById('call-id'),
+            webrtcStatus: document.getElementById('webrtc-status'),
+            webrtcConn: document.getElementById('webrtc-connection-status'),
+            wsStatus: document.getElementById('websocket-status'),
+            wsConn: document.getElementById('websocket-connection-status'),
+            webrtcLog: document.getElementById('webrtc-log'),
+            websocketLog: document.getElementById('websocket-log'),
+            separationLog: document.getElementById('separation-log'),
+        });
+        
+        const STATUS_CLASS = Object.freeze({
+            'Connected': 'status connected',
+            'Disconnected': 'status disconnected',
+            'Connecting': 'status connecting',
+            'Connecting to OpenAI': 'status connecting',
+        });
         
         // Load configuration on page load
         async function loadConfig() {
             try {
-                const response = await fetch('/sideband/config');
+                const response = await fetch('/sideband/config', { signal: sidebandAbort.signal });
                 const config = await response.json();
                 provider = config.provider;
+                useStun = config.use_stun === true;
                 
                 const badge = document.getElementById('provider-badge');
                 const providerName = document.getElementById('provider-name');
@@ -889,61 +1163,81 @@ SIDEBAND_HTML = """
             }
         }
         
-        // Call loadConfig on page load
-        loadConfig();
+        // Log entries are queued and written once per animation frame so a burst
+        // of events costs one layout per panel instead of one per entry.
+        const LOG_MAX_ENTRIES = 400;
+        const _webrtcPending = [];
+        const _websocketPending = [];
+        const _separationPending = [];
+        let _rafScheduled = false;
         
-        function logWebRTC(message, type = 'info') {
-            const log = document.getElementById('webrtc-log');
-            const entry = document.createElement('div');
-            entry.className = `log-entry ${type}`;
-            entry.textContent = `[${new Date().toLocaleTimeString()}] ${message}`;
-            log.appendChild(entry);
-            log.scrollTop = log.scrollHeight;
+        // All three panel loggers come from one factory so their call sites share a shape
+        function makeLogger(pending) {
+            return function (message, type = 'info') {
+                pending.push({ts: new Date().toLocaleTimeString(), message, type});
+                // rAF is paused in background tabs; keep the backlog bounded meanwhile
+                if (pending.length > LOG_MAX_ENTRIES) pending.shift();
+                if (!_rafScheduled) {
+                    _rafScheduled = true;
+                    requestAnimationFrame(flushLogs);
+                }
+            };
         }
         
-        function logWebSocket(message, type = 'info') {
-            const log = document.getElementById('websocket-log');
-            const entry = document.createElement('div');
-            entry.className = `log-entry ${type}`;
-            entry.textContent = `[${new Date().toLocaleTimeString()}] ${message}`;
-            log.appendChild(entry);
+        function flushLogPanel(log, pending) {
+            if (pending.length === 0) return;
+            const fragment = document.createDocumentFragment();
+            for (const {ts, message, type} of pending.splice(0, pending.length)) {
+                const entry = document.createElement('div');
+                entry.className = `log-entry ${type}`;
+                entry.textContent = `[${ts}] ${message}`;
+                fragment.appendChild(entry);
+            }
+            log.appendChild(fragment);
+            let excess = log.childElementCount - LOG_MAX_ENTRIES;
+            while (excess-- > 0) {
+                log.removeChild(log.firstChild);
+            }
             log.scrollTop = log.scrollHeight;
         }
         
-        function logSeparation(message, type = 'info') {
-            const log = document.getElementById('separation-log');
-            const entry = document.createElement('div');
-            entry.className = `log-entry ${type}`;
-            entry.textContent = `[${new Date().toLocaleTimeString()}] ${message}`;
-            log.appendChild(entry);
-            log.scrollTop = log.scrollHeight;
+        function flushLogs() {
+            _rafScheduled = false;
+            flushLogPanel(EL.webrtcLog, _webrtcPending);
+            flushLogPanel(EL.websocketLog, _websocketPending);
+            flushLogPanel(EL.separationLog, _separationPending);
         }
         
+        const logWebRTC = makeLogger(_webrtcPending);
+        const logWebSocket = makeLogger(_websocketPending);
+        const logSeparation = makeLogger(_separationPending);
+        
+        // Call loadConfig on page load (after the loggers it uses exist)
+        loadConfig();
+        
         function updateSessionDisplay() {
-            document.getElementById('session-id').textContent = sessionId || 'Not created';
-            document.getElementById('call-id').textContent = callId || 'Not available';
+            EL.sessionId.textContent = sessionId || 'Not created';
+            EL.callId.textContent = callId || 'Not available';
         }
         
         function updateWebRTCStatus(status) {
-            const el = document.getElementById('webrtc-connection-status');
-            const statusEl = document.getElementById('webrtc-status');
-            el.textContent = status;
-            statusEl.textContent = status;
-            el.className = 'status ' + status.toLowerCase().replace(' ', '-');
+            EL.webrtcConn.textContent = status;
+            EL.webrtcStatus.textContent = status;
+            EL.webrtcConn.className = STATUS_CLASS[status] || 'status';
         }
         
         function updateWebSocketStatus(status) {
-            const el = document.getElementById('websocket-connection-status');
-            const statusEl = document.getElementById('websocket-status');
-            el.textContent = status;
-            statusEl.textContent = status;
-            el.className = 'status ' + status.toLowerCase().replace(' ', '-');
+            EL.wsConn.textContent = status;
+            EL.wsStatus.textContent = status;
+            EL.wsConn.className = STATUS_CLASS[status] || 'status';
         }
         
         async function createSession() {
+            // First user gesture: allowed to start the (autoplay-gated) AudioContext
+            resumeAudioContext();
             try {
                 logWebRTC('Creating new sideband session...', 'info');
-                const response = await fetch('/sideband/session', { method: 'POST' });
+                const response = await fetch('/sideband/session', { method: 'POST', signal: sidebandAbort.signal });
                 const data = await response.json();
                 
                 sessionId = data.session_id;
@@ -963,27 +1257,143 @@ SIDEBAND_HTML = """
             }
         }
         
+        // Remote audio is played through one shared AudioContext instead of an
+        // <audio> element, which adds its own playout buffering.
+        let audioCtx = null;
+        let remoteAudioSink = null;
+        
+        function getAudioContext() {
+            if (audioCtx === null) {
+                try {
+                    audioCtx = new AudioContext({ latencyHint: 'interactive', sampleRate: 48000 });
+                } catch (e) {
+                    console.warn('AudioContext unavailable, using <audio> playback:', e);
+                    audioCtx = false;
+                }
+            }
+            return audioCtx || null;
+        }
+        
+        function resumeAudioContext() {
+            const ctx = getAudioContext();
+            if (ctx && ctx.state === 'suspended') {
+                ctx.resume().catch(e => console.warn('AudioContext resume failed:', e));
+            }
+        }
+        
+        function playRemoteStream(stream) {
+            const ctx = getAudioContext();
+            if (ctx) {
+                try {
+                    ctx.createMediaStreamSource(stream).connect(ctx.destination);
+                    // Chrome only pulls remote WebRTC audio into Web Audio while a
+                    // media element consumes the stream, so keep a muted one attached
+                    remoteAudioSink = new Audio();
+                    remoteAudioSink.muted = true;
+                    remoteAudioSink.srcObject = stream;
+                    return;
+                } catch (e) {
+                    console.warn('Web Audio playback failed, using <audio> playback:', e);
+                }
+            }
+            const audio = new Audio();
+            audio.srcObject = stream;
+            audio.play().catch(e => logWebRTC(`Audio play error: ${e.message}`, 'error'));
+        }
+        
+        function tuneAudioReceiver(receiver) {
+            if (!receiver || receiver.track?.kind !== 'audio') return;
+            try {
+                receiver.jitterBufferTarget = JITTER_BUFFER_TARGET_MS;
+            } catch (e) {
+                // Older Chromium only knows the (seconds-based) playout delay hint
+                try {
+                    receiver.playoutDelayHint = JITTER_BUFFER_TARGET_MS / 1000;
+                } catch (hintError) {
+                    console.warn('Jitter buffer target not supported:', hintError);
+                }
+            }
+        }
+        
+        // Opus parameters pinned on both offer and answer for low-latency playback:
+        // 10 ms packets, no DTX, constant bitrate, mono.
+        const OPUS_LATENCY_FMTP = {minptime: '10', useinbandfec: '1', usedtx: '0', cbr: '1', stereo: '0'};
+        const OPUS_PTIME_LINES = ['a=ptime:10', 'a=maxptime:20'];
+        
+        function tuneOpusSdp(sdp) {
+            const lines = sdp.split('\\r\\n');
+            let inAudio = false;
+            let opusPt = null;
+            const fmtp = {};
+            for (const line of lines) {
+                if (line.startsWith('m=')) {
+                    inAudio = line.startsWith('m=audio');
+                } else if (inAudio && line.startsWith('a=rtpmap:') && line.toLowerCase().includes(' opus/48000')) {
+                    opusPt = line.slice('a=rtpmap:'.length).split(' ')[0];
+                } else if (inAudio && opusPt !== null && line.startsWith(`a=fmtp:${opusPt} `)) {
+                    line.slice(`a=fmtp:${opusPt} `.length).split(';').forEach(param => {
+                        const [key, value] = param.split('=');
+                        if (key) fmtp[key.trim()] = value;
+                    });
+                }
+            }
+            if (opusPt === null) return sdp;
+            
+            Object.assign(fmtp, OPUS_LATENCY_FMTP);
+            const fmtpLine = `a=fmtp:${opusPt} ` + Object.entries(fmtp).map(([key, value]) => `${key}=${value}`).join(';');
+            const out = [];
+            inAudio = false;
+            for (const line of lines) {
+                if (line.startsWith('m=')) {
+                    inAudio = line.startsWith('m=audio');
+                } else if (inAudio && (line.startsWith(`a=fmtp:${opusPt} `) || line.startsWith('a=ptime:') || line.startsWith('a=maxptime:'))) {
+                    continue;
+                }
+                out.push(line);
+                if (inAudio && line.startsWith(`a=rtpmap:${opusPt} `)) {
+                    out.push(fmtpLine, ...OPUS_PTIME_LINES);
+                }
+            }
+            return out.join('\\r\\n');
+        }
+        
+        // The offer is sent once ICE_GRACE_MS have passed since the first candidate
+        const ICE_GRACE_MS = 200;
+        const ICE_GATHER_TIMEOUT_MS = 2000;
+        
         async function connectWebRTC() {
             try {
                 logWebRTC('Initializing WebRTC connection...', 'info');
                 updateWebRTCStatus('Connecting');
                 
+                // Let the server mint the call's ephemeral key while the microphone
+                // and ICE candidates are being set up; the offer falls back to
+                // fetching one itself if this request fails
+                fetch(`/sideband/session/${sessionId}/prefetch-key`, { method: 'POST', signal: sidebandAbort.signal })
+                    .catch(() => {});
+                
                 // Create peer connection
+                // OpenAI's media endpoint is publicly reachable, so host candidates
+                // are enough unless SIDEBAND_USE_STUN asks for reflexive ones too
                 peerConnection = new RTCPeerConnection({
-                    iceServers: [{ urls: 'stun:stun.l.google.com:19302' }]
+                    iceServers: useStun ? [{ urls: 'stun:stun.l.google.com:19302' }] : [],
+                    bundlePolicy: 'max-bundle',
+                    rtcpMuxPolicy: 'require',
+                    iceCandidatePoolSize: 0,
                 });
                 
                 // Set up audio playback
                 peerConnection.ontrack = (event) => {
                     logWebRTC('Received audio track from OpenAI', 'success');
                     logSeparation('Audio track received via WebRTC (direct from OpenAI)', 'success');
-                    const audio = new Audio();
-                    audio.srcObject = event.streams[0];
-                    audio.play().catch(e => logWebRTC(`Audio play error: ${e.message}`, 'error'));
+                    tuneAudioReceiver(event.receiver);
+                    playRemoteStream(event.streams[0]);
                 };
                 
-                // Create data channel for events
-                dataChannel = peerConnection.createDataChannel('oai-events');
+                // Create data channel for events. It only mirrors events for display
+                // (the sideband WebSocket is the authoritative control channel), so
+                // it is unordered and unreliable to avoid head-of-line blocking.
+                dataChannel = peerConnection.createDataChannel('oai-events', { ordered: false, maxRetransmits: 0 });
                 dataChannel.onopen = () => {
                     logWebRTC('Data channel opened', 'success');
                 };
@@ -1016,8 +1426,10 @@ SIDEBAND_HTML = """
                 
                 logWebRTC('Gathering ICE candidates...', 'info');
                 
-                // Wait for ICE gathering with timeout
-                // Some networks never reach 'complete' state, so we use a timeout
+                // Wait for ICE gathering, but not for stragglers: proceed on
+                // completion, on a relay candidate, ICE_GRACE_MS after the first
+                // candidate, or after ICE_GATHER_TIMEOUT_MS at the latest
+                // (some networks never reach 'complete')
                 await new Promise((resolve) => {
                     if (peerConnection.iceGatheringState === 'complete') {
                         logWebRTC('ICE gathering already complete', 'info');
@@ -1025,17 +1437,22 @@ SIDEBAND_HTML = """
                         return;
                     }
                     
-                    // Set a timeout - don't wait forever for ICE gathering
+                    let graceTimer = null;
                     const timeout = setTimeout(() => {
                         logWebRTC('ICE gathering timeout - proceeding with available candidates', 'info');
+                        finish();
+                    }, ICE_GATHER_TIMEOUT_MS);
+                    
+                    function finish() {
+                        clearTimeout(timeout);
+                        clearTimeout(graceTimer);
                         resolve();
-                    }, 2000);  // 2 second timeout
+                    }
                     
                     peerConnection.onicegatheringstatechange = () => {
                         logWebRTC(`ICE gathering state: ${peerConnection.iceGatheringState}`, 'info');
                         if (peerConnection.iceGatheringState === 'complete') {
-                            clearTimeout(timeout);
-                            resolve();
+                            finish();
                         }
                     };
                     
@@ -1043,11 +1460,15 @@ SIDEBAND_HTML = """
                     peerConnection.onicecandidate = (event) => {
                         if (event.candidate) {
                             logWebRTC(`ICE candidate found: ${event.candidate.type || 'unknown'}`, 'info');
+                            if (event.candidate.type === 'relay') {
+                                finish();
+                            } else if (graceTimer === null) {
+                                graceTimer = setTimeout(finish, ICE_GRACE_MS);
+                            }
                         } else {
                             // null candidate means gathering is done
                             logWebRTC('ICE candidate gathering finished', 'info');
-                            clearTimeout(timeout);
-                            resolve();
+                            finish();
                         }
                     };
                 });
@@ -1057,9 +1478,10 @@ SIDEBAND_HTML = """
                 // Exchange offer with server
                 const response = await fetch('/sideband/offer', {
                     method: 'POST',
+                    signal: sidebandAbort.signal,
                     headers: { 'Content-Type': 'application/json' },
                     body: JSON.stringify({
-                        sdp: peerConnection.localDescription.sdp,
+                        sdp: tuneOpusSdp(peerConnection.localDescription.sdp),
                         session_id: sessionId
                     })
                 });
@@ -1076,8 +1498,9 @@ SIDEBAND_HTML = """
                 // Set remote description
                 await peerConnection.setRemoteDescription({
                     type: 'answer',
-                    sdp: data.sdp
+                    sdp: tuneOpusSdp(data.sdp)
                 });
+                peerConnection.getReceivers().forEach(tuneAudioReceiver);
                 
                 logWebRTC(`WebRTC connected! Call ID: ${callId}`, 'success');
                 logWebRTC(`Provider: ${data.provider === 'azure' ? 'Azure OpenAI' : 'OpenAI'}`, 'info');
@@ -1141,6 +1564,81 @@ SIDEBAND_HTML = """
             }
         }
         
+        // Reduces a control frame item to what the UI needs. Runs inside the
+        // parser worker (its source is copied there), or on the main thread
+        // if workers are unavailable.
+        function summarizeControlMessage(data) {
+            if (data.type !== 'openai_event') return data;
+            const eventType = data.event?.type || 'unknown';
+            return {
+                type: 'openai_event',
+                event_type: eventType,
+                error: eventType === 'error' ? data.event : null,
+            };
+        }
+        
+        function controlParserWorker() {
+            self.onmessage = (event) => {
+                const payload = JSON.parse(event.data);
+                const items = Array.isArray(payload) ? payload : [payload];
+                self.postMessage(items.map(summarizeControlMessage));
+            };
+        }
+        
+        let controlParser = null;
+        
+        function getControlParser() {
+            if (controlParser === null && typeof Worker !== 'undefined') {
+                try {
+                    const source = `${summarizeControlMessage};(${controlParserWorker})();`;
+                    const url = URL.createObjectURL(new Blob([source], {type: 'application/javascript'}));
+                    controlParser = new Worker(url);
+                    URL.revokeObjectURL(url);
+                    controlParser.onmessage = (event) => event.data.forEach(handleControlMessage);
+                } catch (e) {
+                    console.warn('Control message worker unavailable, parsing on main thread:', e);
+                    controlParser = false;
+                }
+            }
+            return controlParser || null;
+        }
+        
+        function handleControlMessage(data) {
+            if (data.type === 'sideband_connected') {
+                logWebSocket(`Server connected to OpenAI session: ${data.call_id}`, 'success');
+                logWebSocket(`Provider: ${data.provider === 'azure' ? 'Azure OpenAI' : 'OpenAI'}`, 'info');
+                logSeparation('SUCCESS: Both WebRTC and WebSocket connected to SAME session!', 'success');
+                logSeparation(`Session has TWO connections sharing call_id: ${data.call_id}`, 'success');
+                updateWebSocketStatus('Connected');
+                
+                document.getElementById('btn-update-instructions').disabled = false;
+                document.getElementById('btn-send-message').disabled = false;
+                document.getElementById('btn-connect-websocket').disabled = true;
+                
+            } else if (data.type === 'openai_event') {
+                const eventType = data.event_type;
+                
+                // Show error details when error event is received
+                if (data.error) {
+                    const errorMsg = data.error.error?.message || JSON.stringify(data.error);
+                    const errorCode = data.error.error?.code || 'unknown';
+                    logWebSocket(`ERROR from OpenAI: [${errorCode}] ${errorMsg}`, 'error');
+                    logSeparation(`OpenAI Error: ${errorMsg}`, 'error');
+                    console.error('OpenAI Error Details:', data.error);
+                } else {
+                    logWebSocket(`OpenAI event: ${eventType}`, 'event');
+                    
+                    // Show interesting events in separation log
+                    if (['response.audio.delta', 'input_audio_buffer.speech_started', 'input_audio_buffer.speech_stopped', 'session.created', 'response.done'].includes(eventType)) {
+                        logSeparation(`Server sees: ${eventType} (user audio via WebRTC, events via WebSocket)`, 'event');
+                    }
+                }
+                
+            } else if (data.type === 'error') {
+                logWebSocket(`Error: ${data.message}`, 'error');
+            }
+        }
+        
         function connectWebSocket() {
             if (!callId) {
                 logWebSocket('No call_id available. Connect WebRTC first.', 'error');
@@ -1160,41 +1658,16 @@ SIDEBAND_HTML = """
             };
             
             controlWebSocket.onmessage = (event) => {
-                const data = JSON.parse(event.data);
-                
-                if (data.type === 'sideband_connected') {
-                    logWebSocket(`Server connected to OpenAI session: ${data.call_id}`, 'success');
-                    logWebSocket(`Provider: ${data.provider === 'azure' ? 'Azure OpenAI' : 'OpenAI'}`, 'info');
-                    logSeparation('SUCCESS: Both WebRTC and WebSocket connected to SAME session!', 'success');
-                    logSeparation(`Session has TWO connections sharing call_id: ${data.call_id}`, 'success');
-                    updateWebSocketStatus('Connected');
-                    
-                    document.getElementById('btn-update-instructions').disabled = false;
-                    document.getElementById('btn-send-message').disabled = false;
-                    document.getElementById('btn-connect-websocket').disabled = true;
-                    
-                } else if (data.type === 'openai_event') {
-                    const eventType = data.event?.type || 'unknown';
-                    
-                    // Show error details when error event is received
-                    if (eventType === 'error') {
-                        const errorMsg = data.event?.error?.message || JSON.stringify(data.event);
-                        const errorCode = data.event?.error?.code || 'unknown';
-                        logWebSocket(`ERROR from OpenAI: [${errorCode}] ${errorMsg}`, 'error');
-                        logSeparation(`OpenAI Error: ${errorMsg}`, 'error');
-                        console.error('OpenAI Error Details:', data.event);
-                    } else {
-                        logWebSocket(`OpenAI event: ${eventType}`, 'event');
-                        
-                        // Show interesting events in separation log
-                        if (['response.audio.delta', 'input_audio_buffer.speech_started', 'input_audio_buffer.speech_stopped', 'session.created', 'response.done'].includes(eventType)) {
-                            logSeparation(`Server sees: ${eventType} (user audio via WebRTC, events via WebSocket)`, 'event');
-                        }
-                    }
-                    
-                } else if (data.type === 'error') {
-                    logWebSocket(`Error: ${data.message}`, 'error');
+                // Forwarded OpenAI events arrive batched as a JSON array; parsing
+                // happens off the main thread when a worker is available
+                const parser = getControlParser();
+                if (parser) {
+                    parser.postMessage(event.data);
+                    return;
                 }
+                const payload = JSON.parse(event.data);
+                const items = Array.isArray(payload) ? payload : [payload];
+                items.map(summarizeControlMessage).forEach(handleControlMessage);
             };
             
             controlWebSocket.onclose = () => {
@@ -1207,6 +1680,13 @@ SIDEBAND_HTML = """
             };
         }
         
+        // Pre-serialized command templates; only the user-supplied text is stringified per send
+        const SESSION_UPDATE_PREFIX = '{"type":"session.update","session":{"type":"realtime","instructions":';
+        const SESSION_UPDATE_SUFFIX = '}}';
+        const ITEM_CREATE_PREFIX = '{"type":"conversation.item.create","item":{"type":"message","role":"user","content":[{"type":"input_text","text":';
+        const ITEM_CREATE_SUFFIX = '}]}}';
+        const RESPONSE_CREATE = '{"type":"response.create"}';
+        
         function updateInstructions() {
             if (!controlWebSocket || controlWebSocket.readyState !== WebSocket.OPEN) {
                 logWebSocket('WebSocket not connected', 'error');
@@ -1218,13 +1698,7 @@ SIDEBAND_HTML = """
             logWebSocket('Sending session.update via sideband...', 'info');
             logSeparation('Server updating session instructions (while user audio flows via WebRTC)', 'info');
             
-            controlWebSocket.send(JSON.stringify({
-                type: 'session.update',
-                session: {
-                    type: 'realtime',
-                    instructions: instructions
-                }
-            }));
+            controlWebSocket.send(SESSION_UPDATE_PREFIX + JSON.stringify(instructions) + SESSION_UPDATE_SUFFIX);
         }
         
         function sendServerMessage() {
@@ -1242,28 +1716,17 @@ SIDEBAND_HTML = """
             logWebSocket('Sending message via sideband...', 'info');
             logSeparation('Server injecting message into conversation (independent of user WebRTC)', 'info');
             
-            controlWebSocket.send(JSON.stringify({
-                type: 'conversation.item.create',
-                item: {
-                    type: 'message',
-                    role: 'user',
-                    content: [{
-                        type: 'input_text',
-                        text: message
-                    }]
-                }
-            }));
+            controlWebSocket.send(ITEM_CREATE_PREFIX + JSON.stringify(message) + ITEM_CREATE_SUFFIX);
             
             // Trigger response
-            controlWebSocket.send(JSON.stringify({
-                type: 'response.create'
-            }));
+            controlWebSocket.send(RESPONSE_CREATE);
             
             document.getElementById('message-input').value = '';
         }
         
         // Clean up on page unload
         window.addEventListener('beforeunload', () => {
+            sidebandAbort.abort();
             if (localStream) {
                 localStream.getTracks().forEach(track => track.stop());
             }
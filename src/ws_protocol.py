@@ -0,0 +1,35 @@
+"""
+Uvicorn WebSocket protocol tuned for streaming relays.
+
+The realtime relay streams many small frames per second. With the default
+64 KiB high-water mark the writer drains into the kernel after every few
+frames, which stalls the Azure read loop whenever the client link slows
+down briefly. The protocol also pins TCP_NODELAY and exposes the raw socket
+to handlers as `websocket.state.tcp_socket` so they can cork a group of
+frames into as few segments as possible. uvicorn's `--ws` option only
+accepts its built-in protocol names, so `python -m src.main` passes this
+class to `uvicorn.run` directly.
+"""
+
+import asyncio
+import contextlib
+import socket
+
+from uvicorn.protocols.websockets.websockets_impl import WebSocketProtocol
+
+WRITE_BUFFER_HIGH_WATER = 1 << 20  # 1 MiB
+WRITE_BUFFER_LOW_WATER = 1 << 18  # 256 KiB
+
+
+class BufferedWebSocketProtocol(WebSocketProtocol):
+    """WebSocket protocol that raises the transport write-buffer limits."""
+
+    def connection_made(self, transport: asyncio.Transport) -> None:  # type: ignore[override]
+        super().connection_made(transport)
+        transport.set_write_buffer_limits(high=WRITE_BUFFER_HIGH_WATER, low=WRITE_BUFFER_LOW_WATER)
+        sock = transport.get_extra_info('socket')
+        if sock is not None:
+            with contextlib.suppress(OSError):
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            # uvicorn copies app_state into each connection's ASGI scope["state"]
+            self.app_state = {**self.app_state, 'tcp_socket': sock}
@@ -0,0 +1,25 @@
+"""
+Accept-Encoding negotiation for the precompressed pages in src/precompressed.py.
+
+Run with `python -m pytest tests/test_precompressed.py` from the repository root.
+"""
+
+from src.precompressed import preferred_encoding
+
+
+def test_prefers_brotli_then_gzip():
+    assert preferred_encoding('gzip, deflate, br') == 'br'
+    assert preferred_encoding('gzip, deflate') == 'gzip'
+    assert preferred_encoding('') == 'identity'
+
+
+def test_explicit_refusal_is_honored():
+    assert preferred_encoding('br;q=0, gzip') == 'gzip'
+    assert preferred_encoding('br;q=0.0, gzip;q=0') == 'identity'
+
+
+def test_wildcard_does_not_override_refusal():
+    assert preferred_encoding('br;q=0, *') == 'gzip'
+    assert preferred_encoding('br;q=0, gzip;q=0, *') == 'identity'
+    assert preferred_encoding('*') == 'br'
+    assert preferred_encoding('*;q=0') == 'identity'
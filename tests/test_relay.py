@@ -0,0 +1,75 @@
+"""
+Drives src/main.py's `_relay_to_azure` against a fake realtime connection.
+
+The fake only implements what openai's AsyncRealtimeConnection offers
+(`send` and async iteration), so a call to an SDK method that does not exist
+fails here instead of on the first live turn.
+
+Run with `python -m pytest tests/test_relay.py` from the repository root.
+"""
+
+import asyncio
+import base64
+from types import SimpleNamespace
+
+import orjson
+
+from src.main import AUDIO_FRAME_TAG, RESPONSE_CREATE_EVENT, _relay_to_azure
+
+
+class FakeConnection:
+    def __init__(self, events: list[SimpleNamespace]) -> None:
+        self.sent: list[dict] = []
+        self._events = events
+
+    async def send(self, event: dict) -> None:
+        self.sent.append(event)
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for event in self._events:
+            yield event
+
+
+class FakeWebSocket:
+    def __init__(self) -> None:
+        self.scope: dict = {}
+        self.frames: list[str | bytes] = []
+
+    async def send_text(self, data: str) -> None:
+        self.frames.append(data)
+
+    async def send_bytes(self, data: bytes) -> None:
+        self.frames.append(data)
+
+
+def test_relay_sends_turn_and_forwards_deltas():
+    pcm = b'\x00\x01' * 8
+    connection = FakeConnection([
+        SimpleNamespace(type='response.text.delta', delta='Hello'),
+        SimpleNamespace(type='response.audio.delta', delta=base64.b64encode(pcm).decode()),
+        SimpleNamespace(type='response.audio_transcript.delta', delta='Hi'),
+        SimpleNamespace(type='response.done'),
+        SimpleNamespace(type='response.text.delta', delta='after done'),
+    ])
+    websocket = FakeWebSocket()
+
+    asyncio.run(_relay_to_azure(websocket, connection, 'hi there'))
+
+    assert [event['type'] for event in connection.sent] == ['conversation.item.create', 'response.create']
+    assert connection.sent[0]['item']['content'] == [{'type': 'input_text', 'text': 'hi there'}]
+    assert connection.sent[1] is RESPONSE_CREATE_EVENT
+
+    text_frames = [orjson.loads(frame) for frame in websocket.frames if isinstance(frame, str)]
+    binary_frames = [frame for frame in websocket.frames if isinstance(frame, bytes)]
+    assert text_frames[0] == {'type': 'text-reset'}
+    assert text_frames[1] == {'type': 'transcript-reset'}
+    assert text_frames[-1] == {'type': 'status', 'message': 'Model ready'}
+    batched = [item for frame in text_frames if frame['type'] == 'batch' for item in frame['items']]
+    assert batched == [
+        {'type': 'text-delta', 'value': 'Hello'},
+        {'type': 'transcript-delta', 'value': 'Hi'},
+    ]
+    assert binary_frames == [AUDIO_FRAME_TAG + pcm]
@@ -0,0 +1,58 @@
+"""
+Checks that BufferedWebSocketProtocol hands the tuned TCP socket to handlers.
+
+src/main.py's `_corked` looks the socket up in `scope["state"]["tcp_socket"]`;
+if the protocol is not in use or stops publishing it, corking silently turns
+into a no-op. The test runs a real uvicorn server with the protocol class and
+inspects the scope of an accepted WebSocket connection.
+
+Run with `python -m pytest tests/test_ws_protocol.py` from the repository root.
+"""
+
+import asyncio
+import socket
+
+import uvicorn
+import websockets
+
+from src.ws_protocol import BufferedWebSocketProtocol
+
+
+async def _capture_connection_state() -> dict:
+    captured: dict = {}
+
+    async def app(scope, receive, send):
+        if scope["type"] != "websocket":
+            return
+        captured["state"] = dict(scope["state"])
+        await receive()  # websocket.connect
+        await send({"type": "websocket.accept"})
+        await send({"type": "websocket.close", "code": 1000})
+
+    listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    listener.bind(("127.0.0.1", 0))
+    port = listener.getsockname()[1]
+
+    config = uvicorn.Config(app, ws=BufferedWebSocketProtocol, lifespan="off", log_level="warning")
+    server = uvicorn.Server(config)
+    serve = asyncio.create_task(server.serve(sockets=[listener]))
+    try:
+        while not server.started:
+            await asyncio.sleep(0.01)
+        async with websockets.connect(f"ws://127.0.0.1:{port}/") as ws:
+            await ws.wait_closed()
+    finally:
+        server.should_exit = True
+        await serve
+        listener.close()
+    return captured
+
+
+def test_tcp_socket_reaches_scope_state():
+    captured = asyncio.run(_capture_connection_state())
+
+    sock = captured["state"].get("tcp_socket")
+    assert sock is not None, "BufferedWebSocketProtocol did not publish the socket in scope['state']"
+    assert sock.getsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY) != 0
+
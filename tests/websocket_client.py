@@ -3,15 +3,20 @@
 
 import argparse
 import asyncio
-import json
 import logging
 import os
 import sys
+import time
 import uuid
-from datetime import datetime, timezone
+from collections import Counter
 
 import websockets
 
+try:
+    import uvloop
+except ImportError:  # uvloop is unavailable on Windows; fall back to the default loop
+    uvloop = None
+
 logging.basicConfig(
     level=logging.INFO,
     format="%(asctime)s %(levelname)s %(message)s",
@@ -30,42 +35,108 @@ def parse_args() -> argparse.Namespace:
         default=int(os.getenv("WS_PING_INTERVAL", "30")),
         help="Seconds between heartbeat messages",
     )
+    parser.add_argument(
+        "--concurrency-ramp",
+        type=int,
+        default=int(os.getenv("WS_CONCURRENCY_RAMP", "32")),
+        help="Maximum number of handshakes in flight while connections ramp up",
+    )
     return parser.parse_args()
 
 
-def now() -> str:
-    return datetime.now(timezone.utc).isoformat()
+def now() -> float:
+    # Unix epoch seconds; log records already carry asctime, so this only stamps payloads.
+    return time.time()
 
 
-async def hold_connection(uri: str, duration: int, ping_interval: int, client_id: str) -> None:
-    start = datetime.now(timezone.utc)
-    try:
-        async with websockets.connect(uri, subprotocols=["oai.realtime.v1"]) as socket:
-            LOGGER.info("client.connected", extra={"connectionId": client_id, "ts": now()})
-            while (datetime.now(timezone.utc) - start).total_seconds() < duration:
-                payload = json.dumps({"type": "heartbeat", "connectionId": client_id, "sentAt": now()})
-                await socket.send(payload)
-                await asyncio.sleep(ping_interval)
-            await socket.close(code=1000)
-            LOGGER.info("client.closed", extra={"connectionId": client_id, "ts": now()})
-    except Exception as exc:  # pylint: disable=broad-except
-        LOGGER.error(
-            "client.error",
-            extra={"connectionId": client_id, "error": str(exc), "ts": now()},
+async def connect(uri: str, ramp: asyncio.Semaphore) -> websockets.ClientConnection:
+    # The semaphore only covers the handshake so SYN/TLS bursts stay bounded;
+    # it is released before the connection starts holding.
+    async with ramp:
+        # The heartbeat below keeps the session alive, so library pings and
+        # permessage-deflate are disabled to keep per-connection CPU low.
+        return await websockets.connect(
+            uri,
+            subprotocols=["oai.realtime.v1"],
+            compression=None,
+            max_size=None,
+            ping_interval=None,
+            ping_timeout=None,
+            open_timeout=10,
+            close_timeout=2,
         )
 
 
+async def hold_connection(uri: str, duration: int, ping_interval: int, client_id: str, ramp: asyncio.Semaphore) -> None:
+    socket = await connect(uri, ramp)
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + duration
+    # Only sentAt changes between heartbeats, so the rest of the JSON is built once.
+    payload_prefix = f'{{"type":"heartbeat","connectionId":"{client_id}","sentAt":'
+    # Per-connection lifecycle records are DEBUG only; the run ends with a summary line.
+    debug = LOGGER.isEnabledFor(logging.DEBUG)
+    done = asyncio.Event()
+    failure: list[BaseException] = []
+    next_tick = loop.time()
+    timer: asyncio.TimerHandle | None = None
+
+    def on_sent(task: asyncio.Task[None]) -> None:
+        if not task.cancelled() and task.exception() is not None:
+            failure.append(task.exception())
+            done.set()
+
+    def heartbeat() -> None:
+        # Ticks are scheduled from absolute deadlines, so a slow send never
+        # pushes later heartbeats back.
+        nonlocal next_tick, timer
+        loop.create_task(socket.send(f"{payload_prefix}{now()!r}}}")).add_done_callback(on_sent)
+        next_tick += ping_interval
+        if next_tick < deadline:
+            timer = loop.call_at(next_tick, heartbeat)
+
+    async with socket:
+        if debug:
+            LOGGER.debug("client.connected", extra={"connectionId": client_id})
+        stop = loop.call_at(deadline, done.set)
+        heartbeat()
+        try:
+            await done.wait()
+        finally:
+            stop.cancel()
+            if timer is not None:
+                timer.cancel()
+        if failure:
+            raise failure[0]
+        await socket.close(code=1000)
+        if debug:
+            LOGGER.debug("client.closed", extra={"connectionId": client_id})
+
+
 async def main() -> None:
     args = parse_args()
-    tasks = [
-        asyncio.create_task(hold_connection(args.uri, args.duration, args.ping_interval, str(uuid.uuid4())))
-        for _ in range(args.connections)
-    ]
-    await asyncio.gather(*tasks)
+    ramp = asyncio.Semaphore(max(1, args.concurrency_ramp))
+    results = await asyncio.gather(
+        *(
+            hold_connection(args.uri, args.duration, args.ping_interval, str(uuid.uuid4()), ramp)
+            for _ in range(args.connections)
+        ),
+        return_exceptions=True,
+    )
+    # One summary line instead of an ERROR record per failed connection
+    reasons = Counter(type(result).__name__ for result in results if isinstance(result, BaseException))
+    LOGGER.info(
+        "clients.summary completed=%d failed=%d reasons=%s",
+        len(results) - sum(reasons.values()),
+        sum(reasons.values()),
+        dict(reasons),
+    )
 
 
 if __name__ == "__main__":
     try:
-        asyncio.run(main())
+        if uvloop is not None:
+            uvloop.run(main())
+        else:
+            asyncio.run(main())
     except KeyboardInterrupt:
         sys.exit(130)
@@ -7,23 +7,58 @@ import json
 import logging
 import os
 import signal
+import socket
+import statistics
 import sys
 import time
-import uuid
+from collections import Counter
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from enum import Enum
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
+import httpx
 import websockets
 from websockets.exceptions import ConnectionClosed
 
+try:
+    import orjson
+except ImportError:  # orjson is optional for the test client; fall back to the stdlib codec
+    orjson = None
+
+try:
+    import h2  # noqa: F401  # enables HTTP/2 in httpx
+    HTTP2 = True
+except ImportError:  # h2 is optional; health probes then use HTTP/1.1 keep-alive
+    HTTP2 = False
+
+try:
+    import uvloop
+except ImportError:  # uvloop is unavailable on Windows; fall back to the default loop
+    uvloop = None
+
 logging.basicConfig(
     level=logging.INFO,
     format="%(asctime)s [%(levelname)s] %(message)s",
 )
 LOGGER = logging.getLogger("ws-scaling-test")
 
+SERVER_INFO_TTL = 2.0  # seconds a health probe result is reused across connections
+# The server flushes batched frames once they pass 64 KiB, so a single frame can run
+# somewhat past that; 256 KiB leaves headroom while staying well under the 1 MiB default
+MAX_FRAME_SIZE = 256 * 1024
+MAX_FRAME_QUEUE = 32
+
+if orjson is not None:
+    json_loads = orjson.loads
+
+    def json_dumps(obj) -> str:
+        # The server reads text frames, so hand websockets a str rather than bytes
+        return orjson.dumps(obj).decode()
+else:
+    json_loads = json.loads
+    json_dumps = json.dumps
+
 
 class ConnectionState(Enum):
     """WebSocket connection states."""
@@ -34,7 +69,7 @@ class ConnectionState(Enum):
     ERROR = "error"
 
 
-@dataclass
+@dataclass(slots=True)
 class ConnectionMetrics:
     """Metrics for a single WebSocket connection."""
     connection_id: str
@@ -45,9 +80,13 @@ class ConnectionMetrics:
     messages_received: int = 0
     errors: List[str] = field(default_factory=list)
     last_pong_at: Optional[float] = None
+    rtt_ms: Optional[float] = None
     server_revision: Optional[str] = None
     server_replica_name: Optional[str] = None
     backend_host: Optional[str] = None
+    # Memoized server_info, rebuilt only when one of its inputs changes
+    _server_info_key: Optional[tuple] = field(default=None, init=False, repr=False, compare=False)
+    _server_info: str = field(default="unknown", init=False, repr=False, compare=False)
 
     @property
     def duration(self) -> float:
@@ -65,14 +104,35 @@ class ConnectionMetrics:
     @property
     def server_info(self) -> str:
         """Get formatted server information."""
-        parts = []
-        if self.server_revision:
-            parts.append(f"revision={self.server_revision}")
-        if self.server_replica_name:
-            parts.append(f"replica={self.server_replica_name}")
-        if self.backend_host:
-            parts.append(f"host={self.backend_host}")
-        return ", ".join(parts) if parts else "unknown"
+        key = (self.server_revision, self.server_replica_name, self.backend_host)
+        if key != self._server_info_key:
+            parts = []
+            if self.server_revision:
+                parts.append(f"revision={self.server_revision}")
+            if self.server_replica_name:
+                parts.append(f"replica={self.server_replica_name}")
+            if self.backend_host:
+                parts.append(f"host={self.backend_host}")
+            self._server_info = ", ".join(parts) if parts else "unknown"
+            self._server_info_key = key
+        return self._server_info
+
+
+def tune_socket(websocket) -> None:
+    """Disable Nagle and enable TCP keepalive on the connection's socket."""
+    sock = websocket.transport.get_extra_info("socket")
+    if sock is None:
+        return
+    try:
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+        # Probe idle peers after 30s, then every 10s (options are Linux/Windows names)
+        if hasattr(socket, "TCP_KEEPIDLE"):
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, 30)
+        if hasattr(socket, "TCP_KEEPINTVL"):
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, 10)
+    except OSError as e:
+        LOGGER.debug("Could not tune socket options: %s", e)
 
 
 class WebSocketScalingTest:
@@ -86,165 +146,223 @@ class WebSocketScalingTest:
         ping_interval: int,
         test_message: str,
         health_endpoint: Optional[str] = None,
+        connect_rate: float = 10.0,
     ):
         self.uri = uri
         self.num_connections = num_connections
         self.duration = duration
         self.ping_interval = ping_interval
         self.test_message = test_message
+        # The payload never changes during a run, so encode it once up front
+        self._payload = json_dumps({"text": test_message})
         self.health_endpoint = health_endpoint
+        self.connect_rate = connect_rate
         self.metrics: Dict[str, ConnectionMetrics] = {}
         self.start_time = time.time()
+        # Relative deadlines use the monotonic clock so wall-clock adjustments cannot skew them
+        self._start_mono = time.monotonic()
         self.stop_event = asyncio.Event()
+        # One HTTP client for all health probes so pooled connections are reused
+        self._http: Optional[httpx.AsyncClient] = None
+        # Health probe results are shared between connections for a short while so
+        # a ramp of N connections does not issue N identical GETs
+        self._server_info_cache: Optional[Tuple[float, dict]] = None
+        self._server_info_lock = asyncio.Lock()
+
+    def stop(self) -> None:
+        """Stop the test; installed as the SIGINT/SIGTERM handler."""
+        LOGGER.info("Received interrupt signal, stopping test...")
+        self.stop_event.set()
 
     def now_iso(self) -> str:
         """Get current time in ISO format."""
         return datetime.now(timezone.utc).isoformat()
 
-    async def fetch_server_info(self, connection_id: str) -> None:
+    async def fetch_server_info(self, metrics: ConnectionMetrics) -> None:
         """Fetch server information from health endpoint."""
-        if not self.health_endpoint:
+        if not self.health_endpoint or self._http is None:
             return
         
-        metrics = self.metrics[connection_id]
+        connection_id = metrics.connection_id
         try:
-            import aiohttp
-            async with aiohttp.ClientSession() as session:
-                async with session.get(self.health_endpoint, timeout=aiohttp.ClientTimeout(total=5)) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        metrics.server_revision = data.get("revision", "unknown")
-                        # Extract replica name from environment if available
-                        replica = data.get("replica", os.environ.get("HOSTNAME", ""))
-                        if replica:
-                            metrics.server_replica_name = replica
-                        LOGGER.info(f"[{connection_id}] Server info: {metrics.server_info}")
+            async with self._server_info_lock:
+                cache = self._server_info_cache
+                if cache and time.monotonic() - cache[0] < SERVER_INFO_TTL:
+                    data = cache[1]
+                else:
+                    response = await self._http.get(self.health_endpoint)
+                    if response.status_code != 200:
+                        return
+                    data = json_loads(response.content)
+                    self._server_info_cache = (time.monotonic(), data)
+            metrics.server_revision = data.get("revision", "unknown")
+            # Extract replica name from environment if available
+            replica = data.get("replica", os.environ.get("HOSTNAME", ""))
+            if replica:
+                metrics.server_replica_name = replica
+            LOGGER.info("[%s] Server info: %s", connection_id, metrics.server_info)
         except Exception as e:
-            LOGGER.debug(f"[{connection_id}] Failed to fetch server info: {e}")
+            LOGGER.debug("[%s] Failed to fetch server info: %s", connection_id, e)
 
-    async def send_test_message(self, websocket, connection_id: str) -> None:
+    async def send_test_message(self, websocket, metrics: ConnectionMetrics) -> None:
         """Send a test message to Azure OpenAI and track responses."""
-        metrics = self.metrics[connection_id]
+        connection_id = metrics.connection_id
         try:
-            payload = json.dumps({"text": self.test_message})
-            await websocket.send(payload)
+            await websocket.send(self._payload)
             metrics.messages_sent += 1
-            LOGGER.debug(f"[{connection_id}] Sent test message")
+            LOGGER.debug("[%s] Sent test message", connection_id)
 
-            # Wait for responses (with timeout)
+            # Wait for responses under a single deadline for the whole exchange
             response_timeout = 30
-            start = time.time()
-            while time.time() - start < response_timeout:
-                try:
-                    response = await asyncio.wait_for(websocket.recv(), timeout=1.0)
-                    data = json.loads(response)
-                    metrics.messages_received += 1
-                    
-                    # Check for revision info in health response
-                    if data.get("type") == "status" and "revision" in data:
-                        metrics.server_revision = data["revision"]
-                    
-                    # Break on completion or error
-                    if data.get("type") in ("status", "error"):
-                        if "complete" in data.get("message", "").lower():
-                            break
-                        if data.get("type") == "error":
-                            LOGGER.warning(f"[{connection_id}] Response error: {data.get('message')}")
-                            break
-                except asyncio.TimeoutError:
-                    continue
-                except Exception as e:
-                    LOGGER.warning(f"[{connection_id}] Error receiving response: {e}")
-                    break
+            try:
+                async with asyncio.timeout(response_timeout):
+                    while True:
+                        response = await websocket.recv()
+                        metrics.messages_received += 1
+                        # Audio arrives as tagged binary frames; only JSON frames carry status
+                        if isinstance(response, bytes):
+                            continue
+                        data = json_loads(response)
+                        
+                        # Check for revision info in health response
+                        if data.get("type") == "status" and "revision" in data:
+                            metrics.server_revision = data["revision"]
+                        
+                        # Break on completion or error
+                        if data.get("type") in ("status", "error"):
+                            if "complete" in data.get("message", "").lower():
+                                break
+                            if data.get("type") == "error":
+                                LOGGER.warning("[%s] Response error: %s", connection_id, data.get("message"))
+                                break
+            except TimeoutError:
+                LOGGER.debug("[%s] No completion within %ds", connection_id, response_timeout)
+            except Exception as e:
+                LOGGER.warning("[%s] Error receiving response: %s", connection_id, e)
 
         except Exception as e:
             error_msg = f"Failed to send test message: {e}"
             metrics.errors.append(error_msg)
-            LOGGER.error(f"[{connection_id}] {error_msg}")
+            LOGGER.error("[%s] %s", connection_id, error_msg)
 
-    async def maintain_connection(self, connection_id: str) -> None:
+    async def maintain_connection(self, metrics: ConnectionMetrics) -> None:
         """Maintain a single WebSocket connection and monitor its health."""
-        metrics = ConnectionMetrics(connection_id=connection_id)
-        self.metrics[connection_id] = metrics
+        connection_id = metrics.connection_id
 
         try:
-            LOGGER.info(f"[{connection_id}] Connecting to {self.uri}")
+            LOGGER.info("[%s] Connecting to %s", connection_id, self.uri)
             async with websockets.connect(
                 self.uri,
                 ping_interval=None,  # We'll handle pings manually
                 close_timeout=10,
+                compression=None,  # the server does not negotiate permessage-deflate either
+                max_size=MAX_FRAME_SIZE,
+                max_queue=MAX_FRAME_QUEUE,
             ) as websocket:
                 metrics.state = ConnectionState.CONNECTED
                 metrics.connected_at = time.time()
+                tune_socket(websocket)
                 
                 # Extract backend host from websocket if available
-                if hasattr(websocket, 'remote_address'):
-                    try:
-                        metrics.backend_host = f"{websocket.remote_address[0]}:{websocket.remote_address[1]}"
-                    except Exception:
-                        pass
+                try:
+                    host, port = websocket.remote_address[:2]
+                    metrics.backend_host = f"{host}:{port}"
+                except (AttributeError, TypeError, ValueError):
+                    pass
                 
                 # Fetch server info from health endpoint
-                await self.fetch_server_info(connection_id)
+                await self.fetch_server_info(metrics)
                 
-                LOGGER.info(f"[{connection_id}] Connected at {self.now_iso()} -> {metrics.server_info}")
+                LOGGER.info("[%s] Connected at %s -> %s", connection_id, self.now_iso(), metrics.server_info)
 
                 # Initial test message to establish session
-                await self.send_test_message(websocket, connection_id)
+                await self.send_test_message(websocket, metrics)
                 metrics.state = ConnectionState.ACTIVE
 
-                # Maintain connection with periodic health checks
-                last_ping = time.time()
+                # Maintain connection with periodic health checks. The task sleeps
+                # until the next ping or the end of the test, whichever is sooner;
+                # stopping the test cancels it instead of it polling stop_event.
+                last_ping = time.monotonic()
                 ping_count = 0
-                while not self.stop_event.is_set():
-                    elapsed = time.time() - self.start_time
-                    if elapsed >= self.duration:
-                        LOGGER.info(f"[{connection_id}] Test duration reached, closing")
+                end_at = self._start_mono + self.duration
+                while True:
+                    now = time.monotonic()
+                    if now >= end_at:
+                        LOGGER.info("[%s] Test duration reached, closing", connection_id)
                         break
 
                     # Send periodic ping/heartbeat
-                    if time.time() - last_ping >= self.ping_interval:
+                    next_ping = last_ping + self.ping_interval
+                    if now >= next_ping:
                         try:
-                            # Try to get health status
-                            await websocket.ping()
-                            metrics.last_pong_at = time.time()
-                            last_ping = time.time()
+                            # ping() resolves once the frame is sent; the returned waiter
+                            # resolves when the pong arrives, which gives the real RTT
+                            pong_waiter = await websocket.ping()
+                            sent = time.monotonic()
+                            await asyncio.wait_for(pong_waiter, timeout=self.ping_interval)
+                            last_ping = metrics.last_pong_at = time.monotonic()
+                            metrics.rtt_ms = (last_ping - sent) * 1000
                             ping_count += 1
                             
                             # Periodically log connection status
                             if ping_count % 5 == 0:
-                                LOGGER.info(f"[{connection_id}] Still connected ({metrics.server_info}) - {ping_count} pings")
+                                LOGGER.info("[%s] Still connected (%s) - %d pings", connection_id, metrics.server_info, ping_count)
                             else:
-                                LOGGER.debug(f"[{connection_id}] Ping #{ping_count} successful")
+                                LOGGER.debug("[%s] Ping #%d successful (rtt %.1fms)", connection_id, ping_count, metrics.rtt_ms)
                         except Exception as e:
                             error_msg = f"Ping failed: {e}"
                             metrics.errors.append(error_msg)
-                            LOGGER.warning(f"[{connection_id}] {error_msg}")
+                            LOGGER.warning("[%s] %s", connection_id, error_msg)
                             break
+                        continue
 
-                    await asyncio.sleep(1)
+                    await asyncio.sleep(min(next_ping, end_at) - now)
 
                 # Graceful close
                 await websocket.close(code=1000, reason="Test completed")
                 metrics.state = ConnectionState.DISCONNECTED
                 metrics.disconnected_at = time.time()
                 LOGGER.info(
-                    f"[{connection_id}] Closed gracefully after {metrics.duration:.1f}s (was on {metrics.server_info})"
+                    "[%s] Closed gracefully after %.1fs (was on %s)",
+                    connection_id, metrics.duration, metrics.server_info,
                 )
 
+        except asyncio.CancelledError:
+            # The test was stopped; leaving the async with above closes the socket
+            metrics.state = ConnectionState.DISCONNECTED
+            metrics.disconnected_at = time.time()
+            LOGGER.info(
+                "[%s] Stopped after %.1fs (was on %s)", connection_id, metrics.duration, metrics.server_info
+            )
+            raise
+
         except ConnectionClosed as e:
             metrics.state = ConnectionState.DISCONNECTED
             metrics.disconnected_at = time.time()
             error_msg = f"Connection closed: code={e.code}, reason={e.reason}"
             metrics.errors.append(error_msg)
-            LOGGER.warning(f"[{connection_id}] {error_msg} (duration: {metrics.duration:.1f}s, was on {metrics.server_info})")
+            LOGGER.warning(
+                "[%s] %s (duration: %.1fs, was on %s)", connection_id, error_msg, metrics.duration, metrics.server_info
+            )
 
         except Exception as e:
             metrics.state = ConnectionState.ERROR
             metrics.disconnected_at = time.time()
             error_msg = f"Unexpected error: {type(e).__name__}: {e}"
             metrics.errors.append(error_msg)
-            LOGGER.error(f"[{connection_id}] {error_msg} (was on {metrics.server_info})")
+            LOGGER.error("[%s] %s (was on %s)", connection_id, error_msg, metrics.server_info)
+
+    async def _throttled_connect(self, metrics: ConnectionMetrics, rate_limiter: asyncio.Semaphore) -> None:
+        """Start a connection no sooner than 1/connect_rate seconds after the previous one."""
+        async with rate_limiter:
+            await asyncio.sleep(1 / self.connect_rate)
+        await self.maintain_connection(metrics)
+
+    async def _stop_watcher(self, tasks: List[asyncio.Task]) -> None:
+        """Cancel every connection task once the test is stopped."""
+        await self.stop_event.wait()
+        for task in tasks:
+            task.cancel()
 
     async def run(self) -> None:
         """Run the scaling test with multiple connections."""
@@ -253,101 +371,134 @@ class WebSocketScalingTest:
         LOGGER.info(f"  Connections: {self.num_connections}")
         LOGGER.info(f"  Duration: {self.duration}s")
         LOGGER.info(f"  Ping interval: {self.ping_interval}s")
+        LOGGER.info(f"  Connect rate: {self.connect_rate}/s")
+        LOGGER.info(
+            f"  Frames: compression off, max {MAX_FRAME_SIZE // 1024} KiB, queue {MAX_FRAME_QUEUE} "
+            "(larger frames close the connection with 1009)"
+        )
         if self.health_endpoint:
             LOGGER.info(f"  Health endpoint: {self.health_endpoint}")
         LOGGER.info("=" * 80)
 
-        # Create connection tasks
-        tasks = []
-        for i in range(self.num_connections):
-            connection_id = f"conn-{i+1:03d}-{uuid.uuid4().hex[:8]}"
-            task = asyncio.create_task(self.maintain_connection(connection_id))
-            tasks.append(task)
-            # Stagger connection creation slightly to avoid overwhelming the server
-            await asyncio.sleep(0.1)
-
-        # Wait for all tasks to complete or stop event
-        try:
-            await asyncio.gather(*tasks, return_exceptions=True)
-        except Exception as e:
-            LOGGER.error(f"Error during test execution: {e}")
-        finally:
-            self.stop_event.set()
+        # Build every connection's metrics up front so the dict is never resized
+        # while connections are being established
+        self.metrics = {
+            connection_id: ConnectionMetrics(connection_id=connection_id)
+            for connection_id in (f"conn-{i+1:03d}-{os.urandom(4).hex()}" for i in range(self.num_connections))
+        }
+
+        limits = httpx.Limits(max_connections=4, keepalive_expiry=60)
+        async with httpx.AsyncClient(http2=HTTP2, timeout=5.0, limits=limits) as self._http:
+            # Create connection tasks; the rate limiter staggers their start so the
+            # server is not overwhelmed, without blocking task creation here
+            rate_limiter = asyncio.Semaphore(1)
+            # Wait for all tasks to complete; a stop cancels whatever is still running.
+            # The watcher lives outside the group so it does not hold the group open.
+            tasks: List[asyncio.Task] = []
+            stop_watcher = asyncio.create_task(self._stop_watcher(tasks))
+            try:
+                async with asyncio.TaskGroup() as tg:
+                    for metrics in self.metrics.values():
+                        tasks.append(tg.create_task(self._throttled_connect(metrics, rate_limiter)))
+            except* Exception as eg:
+                for e in eg.exceptions:
+                    LOGGER.error(f"Error during test execution: {e}")
+            finally:
+                stop_watcher.cancel()
+                self.stop_event.set()
 
     def print_summary(self) -> None:
         """Print test summary and statistics."""
-        LOGGER.info("=" * 80)
-        LOGGER.info("TEST SUMMARY")
-        LOGGER.info("=" * 80)
-
         total_connections = len(self.metrics)
-        successful = sum(1 for m in self.metrics.values() if m.state == ConnectionState.DISCONNECTED and not m.errors)
-        failed = sum(1 for m in self.metrics.values() if m.state == ConnectionState.ERROR or m.errors)
-        still_connected = sum(1 for m in self.metrics.values() if m.is_alive)
 
-        LOGGER.info(f"Total connections: {total_connections}")
-        LOGGER.info(f"  Successful: {successful}")
-        LOGGER.info(f"  Failed: {failed}")
-        LOGGER.info(f"  Still connected: {still_connected}")
+        # Single pass over all connections for states, durations, message totals and groupings
+        successful = 0
+        failed = 0
+        not_started = 0
+        still_connected = 0
+        durations: List[float] = []
+        rtts: List[float] = []
+        total_messages = 0
+        total_received = 0
+        revisions: Counter = Counter()
+        replicas: Counter = Counter()
+        backends: Counter = Counter()
+        for m in self.metrics.values():
+            if m.state == ConnectionState.ERROR or m.errors:
+                failed += 1
+            elif m.state == ConnectionState.DISCONNECTED:
+                successful += 1
+            elif m.state == ConnectionState.CONNECTING:
+                # Metrics are built up front, so a stop can leave some never started
+                not_started += 1
+            if m.is_alive:
+                still_connected += 1
+            duration = m.duration
+            if duration > 0:
+                durations.append(duration)
+            if m.rtt_ms is not None:
+                rtts.append(m.rtt_ms)
+            total_messages += m.messages_sent
+            total_received += m.messages_received
+            if m.server_revision:
+                revisions[m.server_revision] += 1
+            if m.server_replica_name:
+                replicas[m.server_replica_name] += 1
+            if m.backend_host:
+                backends[m.backend_host] += 1
+
+        # Build the whole report first and emit it as one log record
+        out = ["=" * 80, "TEST SUMMARY", "=" * 80]
+        out.append(f"Total connections: {total_connections}")
+        out.append(f"  Successful: {successful}")
+        out.append(f"  Failed: {failed}")
+        out.append(f"  Not started: {not_started}")
+        out.append(f"  Still connected: {still_connected}")
 
         if self.metrics:
-            durations = [m.duration for m in self.metrics.values() if m.duration > 0]
             if durations:
-                avg_duration = sum(durations) / len(durations)
-                max_duration = max(durations)
-                min_duration = min(durations)
-                LOGGER.info(f"\nConnection duration:")
-                LOGGER.info(f"  Average: {avg_duration:.1f}s")
-                LOGGER.info(f"  Max: {max_duration:.1f}s")
-                LOGGER.info(f"  Min: {min_duration:.1f}s")
-
-            total_messages = sum(m.messages_sent for m in self.metrics.values())
-            total_received = sum(m.messages_received for m in self.metrics.values())
-            LOGGER.info(f"\nMessages:")
-            LOGGER.info(f"  Sent: {total_messages}")
-            LOGGER.info(f"  Received: {total_received}")
-
-            # Group by server revision
-            revisions = {}
-            for m in self.metrics.values():
-                if m.server_revision:
-                    revisions[m.server_revision] = revisions.get(m.server_revision, 0) + 1
-            if revisions:
-                LOGGER.info(f"\nServer revisions:")
-                for rev, count in sorted(revisions.items()):
-                    LOGGER.info(f"  {rev}: {count} connections")
-            
-            # Group by replica
-            replicas = {}
-            for m in self.metrics.values():
-                if m.server_replica_name:
-                    replicas[m.server_replica_name] = replicas.get(m.server_replica_name, 0) + 1
-            if replicas:
-                LOGGER.info(f"\nServer replicas:")
-                for replica, count in sorted(replicas.items()):
-                    LOGGER.info(f"  {replica}: {count} connections")
-            
-            # Group by backend host
-            backends = {}
-            for m in self.metrics.values():
-                if m.backend_host:
-                    backends[m.backend_host] = backends.get(m.backend_host, 0) + 1
-            if backends:
-                LOGGER.info(f"\nBackend hosts:")
-                for host, count in sorted(backends.items()):
-                    LOGGER.info(f"  {host}: {count} connections")
+                out.append("")
+                out.append("Connection duration:")
+                out.append(f"  Average: {statistics.fmean(durations):.1f}s")
+                out.append(f"  Max: {max(durations):.1f}s")
+                out.append(f"  Min: {min(durations):.1f}s")
+
+            if rtts:
+                out.append("")
+                out.append("Ping RTT (last per connection):")
+                out.append(f"  Average: {statistics.fmean(rtts):.1f}ms")
+                out.append(f"  Max: {max(rtts):.1f}ms")
+
+            out.append("")
+            out.append("Messages:")
+            out.append(f"  Sent: {total_messages}")
+            out.append(f"  Received: {total_received}")
+
+            # Group by server revision, replica and backend host
+            for title, groups in (
+                ("Server revisions", revisions),
+                ("Server replicas", replicas),
+                ("Backend hosts", backends),
+            ):
+                if groups:
+                    out.append("")
+                    out.append(f"{title}:")
+                    for key, count in sorted(groups.items()):
+                        out.append(f"  {key}: {count} connections")
 
         # List connections with errors
         errors = [(conn_id, m) for conn_id, m in self.metrics.items() if m.errors]
         if errors:
-            LOGGER.info(f"\nConnections with errors ({len(errors)}):")
+            out.append("")
+            out.append(f"Connections with errors ({len(errors)}):")
             for conn_id, m in errors[:10]:  # Show first 10
                 error_summary = ', '.join(m.errors[:3])
-                LOGGER.info(f"  [{conn_id}] ({m.server_info}) {error_summary}")
+                out.append(f"  [{conn_id}] ({m.server_info}) {error_summary}")
             if len(errors) > 10:
-                LOGGER.info(f"  ... and {len(errors) - 10} more")
+                out.append(f"  ... and {len(errors) - 10} more")
 
-        LOGGER.info("=" * 80)
+        out.append("=" * 80)
+        LOGGER.info("\n".join(out))
 
 
 def parse_args() -> argparse.Namespace:
@@ -367,6 +518,9 @@ Example usage:
   # Stress test with 50 connections for 10 minutes
   python tests/websocket_scaling_test.py wss://your-host.example.com/chat --connections 50 --duration 600
 
+  # Ramp 200 connections at 50 new connections per second
+  python tests/websocket_scaling_test.py wss://your-host.example.com/chat --connections 200 --connect-rate 50
+
   # Quick test with frequent pings
   python tests/websocket_scaling_test.py wss://your-host.example.com/chat --connections 5 --duration 120 --ping-interval 5
 
@@ -404,6 +558,12 @@ During the test, you can:
         default=int(os.getenv("WS_PING_INTERVAL", "30")),
         help="Seconds between ping messages (default: 30)",
     )
+    parser.add_argument(
+        "--connect-rate",
+        type=float,
+        default=float(os.getenv("WS_CONNECT_RATE", "10")),
+        help="New connections started per second (default: 10)",
+    )
     parser.add_argument(
         "--test-message",
         type=str,
@@ -433,15 +593,16 @@ async def main() -> None:
         ping_interval=args.ping_interval,
         test_message=args.test_message,
         health_endpoint=args.health_endpoint if args.health_endpoint else None,
+        connect_rate=max(args.connect_rate, 0.001),
     )
 
-    # Handle graceful shutdown
-    def signal_handler(sig, frame):
-        LOGGER.info("\nReceived interrupt signal, stopping test...")
-        test.stop_event.set()
-
-    signal.signal(signal.SIGINT, signal_handler)
-    signal.signal(signal.SIGTERM, signal_handler)
+    # Handle graceful shutdown inside the loop so waiters wake immediately
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, test.stop)
+        except NotImplementedError:  # Windows: Ctrl+C surfaces as KeyboardInterrupt instead
+            pass
 
     try:
         await test.run()
@@ -449,8 +610,18 @@ async def main() -> None:
         test.print_summary()
 
 
+def new_event_loop() -> asyncio.AbstractEventLoop:
+    """Create the test's event loop (uvloop if installed), with eager task execution where supported (3.12+)."""
+    loop = uvloop.new_event_loop() if uvloop is not None else asyncio.new_event_loop()
+    eager_task_factory = getattr(asyncio, "eager_task_factory", None)
+    if eager_task_factory is not None:
+        loop.set_task_factory(eager_task_factory)
+    return loop
+
+
 if __name__ == "__main__":
     try:
-        asyncio.run(main())
+        with asyncio.Runner(loop_factory=new_event_loop) as runner:
+            runner.run(main())
     except KeyboardInterrupt:
         sys.exit(130)
\ No newline at end of file